@@ -7,6 +7,11 @@ from .crwl import (
     get_state,
     extract_ingame_category,
     extract_state,
+    extract_from_state,
+    aextract_offers_or_final_produce,
+    aextract_many,
+    extract_many,
+    invalidate_state_cache,
 )
 
 logger = logging.getLogger(__name__)
@@ -17,5 +22,10 @@ __all__ = [
     "get_state",
     "extract_ingame_category",
     "extract_state",
+    "extract_from_state",
+    "aextract_offers_or_final_produce",
+    "aextract_many",
+    "extract_many",
+    "invalidate_state_cache",
     "logger",
 ]
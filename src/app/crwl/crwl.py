@@ -1,98 +1,416 @@
-from app.shared.consts import WINDOW_PRELOADEDSTATE_EXPRESSION
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+from app.shared.consts import (
+    STATE_JSON_EXPRESSION,
+    STATE_READY_EXPRESSION,
+    STATE_READY_TIMEOUT,
+    STATE_READY_POLL_INTERVAL,
+    STATE_CACHE_MAX_SIZE,
+    STATE_CACHE_TTL,
+    STATE_CRAWL_MAX_RETRIES,
+    STATE_EXTRACT_MAX_RETRIES,
+    STATE_RETRY_INTERVAL,
+)
 from .models import (
     CrwlOffer,
+    OfferPrice,
+    Seller,
     FinalProduct,
+    FinalProductPrice,
+    FinalProductAttribute,
+    FinalProductIngameAttributes,
     ExtractedFinalProduct,
     ExtractedOffer,
 )
 from .exceptions import CrwlError
 from app.shared.decorators import retry_on_fail
+from app import config
+
+T = TypeVar("T")
+
+# Validate whole collections in one call instead of one model at a time
+_OFFERS_ADAPTER: TypeAdapter[list[CrwlOffer]] = TypeAdapter(list[CrwlOffer])
+_FINAL_PRODUCTS_ADAPTER: TypeAdapter[list[FinalProduct]] = TypeAdapter(
+    list[FinalProduct]
+)
+
+
+class StateCache:
+    """Recently crawled states by URL, shared by all worker threads"""
+
+    def __init__(
+        self,
+        max_size: int = STATE_CACHE_MAX_SIZE,
+        ttl: float = STATE_CACHE_TTL,
+    ) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self._states: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def get(
+        self,
+        url: str,
+    ) -> dict | None:
+        with self._lock:
+            cached = self._states.get(url)
+            if cached is None:
+                return None
+
+            stored_at, state = cached
+            if time.monotonic() - stored_at > self.ttl:
+                del self._states[url]
+                return None
+
+            self._states.move_to_end(url)
+            return state
+
+    def put(
+        self,
+        url: str,
+        state: dict,
+    ) -> None:
+        with self._lock:
+            self._states[url] = (time.monotonic(), state)
+            self._states.move_to_end(url)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+
+    def invalidate(
+        self,
+        url: str | None = None,
+    ) -> None:
+        with self._lock:
+            if url is None:
+                self._states.clear()
+            else:
+                self._states.pop(url, None)
+
+
+state_cache = StateCache()
+
+
+def invalidate_state_cache(
+    url: str | None = None,
+) -> None:
+    """Drop the cached state of url, or of every URL when url is None"""
+    state_cache.invalidate(url)
+
+
+def _construct_offer(
+    offer: dict,
+) -> CrwlOffer:
+    price = offer["price"]
+    seller = offer["seller"]
+    return CrwlOffer.model_construct(
+        id=offer["id"],
+        productId=offer["productId"],
+        price=OfferPrice.model_construct(
+            amount=price["amount"], currency=price["currency"]
+        ),
+        seller=Seller.model_construct(id=seller["id"], name=seller["name"]),
+        minQuantity=offer["minQuantity"],
+        unitPrice=offer["unitPrice"],
+    )
+
+
+def _construct_final_product(
+    fp: dict,
+) -> FinalProduct:
+    price = fp["price"]
+    ingame_attributes = fp["ingameAttributes"]
+    return FinalProduct.model_construct(
+        id=fp["id"],
+        offerId=fp["offerId"],
+        externalId=fp["externalId"],
+        price=FinalProductPrice.model_construct(
+            calculated=price["calculated"], lowestOffer=price["lowestOffer"]
+        ),
+        attributes=FinalProductAttribute.model_construct(
+            urlKey=fp["attributes"]["urlKey"]
+        ),
+        ingameAttributes=FinalProductIngameAttributes.model_construct(
+            minQuantity=ingame_attributes["minQuantity"],
+            unitPrice=ingame_attributes["unitPrice"],
+        ),
+    )
+
+
+def _construct_or_validate(
+    items: list,
+    construct: Callable[[dict], T],
+    adapter: TypeAdapter[list[T]],
+) -> list[T]:
+    if config.CRWL_FAST_VALIDATION:
+        try:
+            return [construct(item) for item in items]
+        except (KeyError, TypeError):
+            # Schema drifted, let pydantic report what is wrong
+            pass
+
+    return adapter.validate_python(items)
+
+
+def _crwl_delay(
+    exception: Exception,
+    attempt: int,
+) -> float | None:
+    # Pick a retry delay by failure cause, None keeps the decorator default
+    if isinstance(exception, CrwlError):
+        # State not published yet, usually ready a moment later
+        return 0.2
+
+    message = str(exception).lower()
+    if "detach" in message or "target closed" in message:
+        return 0.5
+    if "429" in message or "rate limit" in message or "too many requests" in message:
+        return min(30, 0.5 * 2**attempt) + random.uniform(0, 0.25)
+
+    return None
 
 
-@retry_on_fail(max_retries=3, sleep_interval=5)
+def _crwl_give_up(
+    exception: Exception,
+) -> bool:
+    # A state that extract_from_state rejects on validation will be rejected
+    # again on retry, unlike one that is not hydrated yet (CrwlError)
+    return isinstance(exception, ValidationError)
+
+
+@retry_on_fail(
+    max_retries=STATE_EXTRACT_MAX_RETRIES,
+    sleep_interval=STATE_RETRY_INTERVAL,
+    delay_fn=_crwl_delay,
+)
 def extract_state(
     sb,
 ):
-    sb.cdp.get_page_source()
-    state = sb.cdp.evaluate(WINDOW_PRELOADEDSTATE_EXPRESSION)
+    # A plain evaluate is one round-trip; a Runtime.compileScript id would not
+    # survive the navigation in get_state, so there is nothing to reuse.
+    # The state crosses CDP as one JSON string and is decoded here
+    state_json = sb.cdp.evaluate(STATE_JSON_EXPRESSION)
+    state = _json_loads(state_json) if state_json else None
     if state is None:
         raise CrwlError("Cannot get data from web!!! State is None")
     return state
 
 
-@retry_on_fail(max_retries=10, sleep_interval=5)
-def get_state(
+def wait_for_state(
+    sb,
+    timeout: float = STATE_READY_TIMEOUT,
+    poll_interval: float = STATE_READY_POLL_INTERVAL,
+) -> None:
+    # Return as soon as the page is loaded and the state is published,
+    # falling back to the old fixed wait when it never shows up
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if sb.cdp.evaluate(STATE_READY_EXPRESSION):
+            return
+        sb.cdp.sleep(poll_interval)
+
+
+def _load_state(
     sb,
     url: str,
-):
+) -> dict:
     sb.cdp.get(url)
-    sb.cdp.sleep(2)
-    sb.cdp.get_page_source()
-    state = extract_state(sb)
-    return state
+    wait_for_state(sb)
+    return extract_state(sb)
 
 
-def dict_to_crwl_offer(
-    offer: dict,
-) -> CrwlOffer:
-    return CrwlOffer.model_validate(offer)
+@retry_on_fail(
+    max_retries=STATE_CRAWL_MAX_RETRIES,
+    sleep_interval=STATE_RETRY_INTERVAL,
+    delay_fn=_crwl_delay,
+)
+def get_state(
+    sb,
+    url: str,
+):
+    return _load_state(sb, url)
 
 
 def extract_offers(
     state: dict,
 ) -> dict[str, CrwlOffer]:
-    offers_dict: dict[str, CrwlOffer] = {}
-
     offers_field = state["offers"]
 
-    # Main offer
-    main_offer = offers_field["mainOffer"]
-    main_offer = dict_to_crwl_offer(main_offer)
-    offers_dict[main_offer.id] = main_offer
+    # Main offer first so it wins over duplicates in the collection
+    offers = _construct_or_validate(
+        [offers_field["mainOffer"], *offers_field["collection"]],
+        _construct_offer,
+        _OFFERS_ADAPTER,
+    )
 
-    # Colection
-    for offer in offers_field["collection"]:
-        ofr = dict_to_crwl_offer(offer)
-        if ofr.id in offers_dict:
-            continue
-        offers_dict[ofr.id] = ofr
+    offers_dict: dict[str, CrwlOffer] = {}
+    for offer in offers:
+        offers_dict.setdefault(offer.id, offer)
 
     return offers_dict
 
 
-def dict_to_final_product(
-    fp: dict,
-) -> FinalProduct:
-    return FinalProduct.model_validate(fp)
-
-
 def extract_ingame_category(
     state: dict,
 ) -> dict[str, FinalProduct]:
-    final_products_dict: dict[str, FinalProduct] = {}
-
     ingame_category_field = state["ingameCategory"]
-    for final_product in ingame_category_field["finalProducts"]["list"]:
-        fp = dict_to_final_product(final_product)
-        final_products_dict[fp.id] = fp
+    final_products = _construct_or_validate(
+        ingame_category_field["finalProducts"]["list"],
+        _construct_final_product,
+        _FINAL_PRODUCTS_ADAPTER,
+    )
 
-    return final_products_dict
+    return {fp.id: fp for fp in final_products}
 
 
+def extract_from_state(
+    state: dict,
+) -> ExtractedOffer | ExtractedFinalProduct:
+    offers_field = state.get("offers")
+    if isinstance(offers_field, dict) and offers_field.get("mainOffer"):
+        return ExtractedOffer.model_construct(data=extract_offers(state))
+
+    ingame_category_field = state.get("ingameCategory")
+    if (
+        isinstance(ingame_category_field, dict)
+        and ingame_category_field.get("finalProducts")
+    ):
+        return ExtractedFinalProduct.model_construct(
+            data=extract_ingame_category(state)
+        )
+
+    raise CrwlError("Cannot extract from compare link!!!")
+
+
+@retry_on_fail(
+    max_retries=STATE_CRAWL_MAX_RETRIES,
+    sleep_interval=STATE_RETRY_INTERVAL,
+    delay_fn=_crwl_delay,
+    give_up=_crwl_give_up,
+)
 def extract_offers_or_final_produce(
     sb,
     url: str,
 ) -> ExtractedOffer | ExtractedFinalProduct:
-    state = get_state(sb, url)
+    state = state_cache.get(url)
+    if state is not None:
+        return extract_from_state(state)
+
+    # Extract inside the retry and cache only what extracted, so a state
+    # that is still hydrating is crawled again instead of being served
+    state = _load_state(sb, url)
+    extracted_data = extract_from_state(state)
+    state_cache.put(url, state)
+    return extracted_data
 
+
+@retry_on_fail(
+    max_retries=STATE_EXTRACT_MAX_RETRIES,
+    sleep_interval=STATE_RETRY_INTERVAL,
+    delay_fn=_crwl_delay,
+)
+async def _aextract_state(
+    tab,
+) -> dict:
+    # Async twin of extract_state, for a page loaded in its own tab
+    state_json = await tab.evaluate(STATE_JSON_EXPRESSION)
+    state = _json_loads(state_json) if state_json else None
+    if state is None:
+        raise CrwlError("Cannot get data from web!!! State is None")
+    return state
+
+
+async def _aload_state(
+    sb,
+    url: str,
+) -> dict:
+    # Each call drives its own tab so several pages can load at once
+    driver = sb.cdp.driver
+    if hasattr(driver, "cdp_base"):
+        driver = driver.cdp_base
+
+    tab = None
     try:
-        return ExtractedOffer(data=extract_offers(state))
-    except Exception:
-        pass
+        tab = await driver.get(url, new_tab=True)
+        deadline = time.monotonic() + STATE_READY_TIMEOUT
+        while time.monotonic() < deadline:
+            if await tab.evaluate(STATE_READY_EXPRESSION):
+                break
+            await asyncio.sleep(STATE_READY_POLL_INTERVAL)
+
+        return await _aextract_state(tab)
+
+    finally:
+        if tab is not None:
+            await tab.close()
 
+
+@retry_on_fail(
+    max_retries=STATE_CRAWL_MAX_RETRIES,
+    sleep_interval=STATE_RETRY_INTERVAL,
+    delay_fn=_crwl_delay,
+    give_up=_crwl_give_up,
+)
+async def aextract_offers_or_final_produce(
+    sb,
+    url: str,
+) -> ExtractedOffer | ExtractedFinalProduct:
+    state = state_cache.get(url)
+    if state is not None:
+        return extract_from_state(state)
+
+    # Same policy as extract_offers_or_final_produce
+    state = await _aload_state(sb, url)
+    extracted_data = extract_from_state(state)
+    state_cache.put(url, state)
+    return extracted_data
+
+
+async def aextract_many(
+    sb,
+    urls: list[str],
+    *,
+    concurrency: int = 8,
+) -> list[ExtractedOffer | ExtractedFinalProduct]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(url: str) -> ExtractedOffer | ExtractedFinalProduct:
+        async with semaphore:
+            return await aextract_offers_or_final_produce(sb, url)
+
+    tasks = [asyncio.ensure_future(_one(url)) for url in urls]
     try:
-        return ExtractedFinalProduct(data=extract_ingame_category(state))
-    except Exception:
-        pass
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # gather leaves the other tasks scheduled on the browser loop, where
+        # they would resume driving tabs during the next sync crawl
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
-    raise CrwlError("Cannot extract from compare link!!!")
+
+def extract_many(
+    sb,
+    urls: list[str],
+    concurrency: int = 8,
+) -> list[ExtractedOffer | ExtractedFinalProduct]:
+    # The browser connection is bound to seleniumbase's own event loop
+    return sb.cdp.loop.run_until_complete(
+        aextract_many(sb, urls, concurrency=concurrency)
+    )
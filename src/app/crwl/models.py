@@ -1,17 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
-class OfferPrice(BaseModel):
+class CrwlModel(BaseModel):
+    # Parsed payloads are read-only, and unknown fields are dropped
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class OfferPrice(CrwlModel):
     amount: int
     currency: str
 
 
-class Seller(BaseModel):
+class Seller(CrwlModel):
     id: int
     name: str
 
 
-class CrwlOffer(BaseModel):
+class CrwlOffer(CrwlModel):
     id: str
     productId: str
     price: OfferPrice
@@ -20,21 +25,21 @@ class CrwlOffer(BaseModel):
     unitPrice: float | int
 
 
-class FinalProductPrice(BaseModel):
+class FinalProductPrice(CrwlModel):
     calculated: int
     lowestOffer: int
 
 
-class FinalProductAttribute(BaseModel):
+class FinalProductAttribute(CrwlModel):
     urlKey: str
 
 
-class FinalProductIngameAttributes(BaseModel):
+class FinalProductIngameAttributes(CrwlModel):
     minQuantity: int | None
     unitPrice: float | int
 
 
-class FinalProduct(BaseModel):
+class FinalProduct(CrwlModel):
     id: str
     offerId: str
     externalId: str
@@ -43,7 +48,7 @@ class FinalProduct(BaseModel):
     ingameAttributes: FinalProductIngameAttributes
 
 
-class ExtractedData(BaseModel):
+class ExtractedData(CrwlModel):
     pass
 
 
@@ -17,16 +17,17 @@ Example:
     .cache
 """
 
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from pydantic import BaseModel, Field
 
-
-class GSheetCacheConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GSheetCacheConfig:
     """Configuration for gsheet-cache directories.
 
     This class holds the configuration for where cache files and service account
-    keys are stored. It uses Pydantic for validation and provides sensible defaults.
+    keys are stored. It is a frozen dataclass with sensible defaults; string
+    paths are converted to Path objects.
 
     Attributes:
         cache_dir: Directory path where CSV cache files are stored.
@@ -46,11 +47,12 @@ class GSheetCacheConfig(BaseModel):
         ... )
     """
 
-    cache_dir: Path = Field(
-        default=Path(".gsheet_cache"),
-        description="Directory for storing cached CSV files"
-    )
-    keys_dir: Path = Field(
-        default=Path("keys"),
-        description="Directory containing service account JSON keys"
-    )
+    # Directory for storing cached CSV files
+    cache_dir: Path = field(default_factory=lambda: Path(".gsheet_cache"))
+    # Directory containing service account JSON keys
+    keys_dir: Path = field(default_factory=lambda: Path("keys"))
+
+    def __post_init__(self) -> None:
+        """Accept plain strings for the directory paths."""
+        object.__setattr__(self, "cache_dir", Path(self.cache_dir))
+        object.__setattr__(self, "keys_dir", Path(self.keys_dir))
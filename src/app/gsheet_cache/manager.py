@@ -16,8 +16,26 @@ Example:
     >>> value = manager.get_value("spreadsheet_id_1", "Sheet1", "A1")
 """
 
+import asyncio
+import logging
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
 from .config import GSheetCacheConfig
 from .sheet import CacheSheet
+from .utils import dir_exists, ensure_dir
+
+logger = logging.getLogger(__name__)
+
+# Cell references come from a small fixed vocabulary and are used as dict
+# keys downstream, so interning them keeps their hash cached
+_intern = sys.intern
+
+# Maximum number of spreadsheets fetched at once by bulk_load()
+_LOAD_WORKERS = 4
 
 
 class GSheetCacheManager:
@@ -49,6 +67,18 @@ class GSheetCacheManager:
         >>> manager.flush_to_sheet("spreadsheet_1", "Sales", ["A1"])
     """
 
+    __slots__ = (
+        "config",
+        "sheets",
+        "_last",
+        "_flush_timer",
+        "_flush_lock",
+        "_sync_lock",
+        "_add_lock",
+        "_loading",
+        "_load_executor",
+    )
+
     def __init__(self, config: GSheetCacheConfig):
         """Initialize the GSheetCacheManager.
 
@@ -68,9 +98,28 @@ class GSheetCacheManager:
         self.config = config
         # A dict to hold CacheSheet instances, keyed by (sheet_id, sheet_name)
         self.sheets: dict[tuple[str, str], CacheSheet] = {}
+        # Most recently looked up (key, sheet) pair, swapped as one tuple so
+        # concurrent readers never see a key paired with another sheet
+        self._last: tuple[tuple[str, str], CacheSheet] | None = None
+        # Pending deferred flush started by schedule_flush(), if any
+        self._flush_timer: threading.Timer | None = None
+        self._flush_lock = threading.Lock()
+        # Serializes flush_all(), so a scheduled flush starting while another
+        # one is in flight does not send the same pending cells again
+        self._sync_lock = threading.Lock()
+        # Guards _loading; only held to claim or settle a sheet, never
+        # across a fetch
+        self._add_lock = threading.Lock()
+        # Sheets being fetched, so concurrent callers adding the same sheet
+        # wait for that fetch instead of starting another one
+        self._loading: dict[tuple[str, str], Future[CacheSheet]] = {}
+        # Shared by bulk_load() calls, its threads are started on first use
+        self._load_executor = ThreadPoolExecutor(
+            max_workers=_LOAD_WORKERS, thread_name_prefix="gsheet-load"
+        )
 
         # Ensure cache directory exists
-        self.config.cache_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.config.cache_dir)
 
         self.__check_keys_dir()
 
@@ -80,7 +129,7 @@ class GSheetCacheManager:
         Raises:
             FileNotFoundError: If the configured keys directory doesn't exist.
         """
-        if not self.config.keys_dir.exists():
+        if not dir_exists(self.config.keys_dir):
             raise FileNotFoundError(
                 f"Keys directory does not exist: {self.config.keys_dir}"
             )
@@ -89,7 +138,9 @@ class GSheetCacheManager:
         """Add a new CacheSheet to the manager.
 
         If a sheet with the same ID and name already exists, returns the
-        existing instance instead of creating a new one.
+        existing instance instead of creating a new one. Safe to call from
+        several threads: a sheet is only fetched once, and only callers adding
+        that same sheet wait for the fetch.
 
         Args:
             sheet_id: The Google Sheets spreadsheet ID.
@@ -106,9 +157,150 @@ class GSheetCacheManager:
             >>> assert sheet is same_sheet
         """
         key = (sheet_id, sheet_name)
-        if key not in self.sheets:
-            self.sheets[key] = CacheSheet(sheet_id, sheet_name, self.config)
-        return self.sheets[key]
+        sheet = self.sheets.get(key)
+        if sheet is not None:
+            return sheet
+
+        with self._add_lock:
+            sheet = self.sheets.get(key)
+            if sheet is not None:
+                return sheet
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+
+        if not owner:
+            # Another thread is fetching this very sheet
+            return future.result()
+
+        try:
+            sheet = CacheSheet(sheet_id, sheet_name, self.config)
+        except BaseException as e:
+            self.__settle(key, error=e)
+            raise
+        self.__settle(key, sheet)
+        return sheet
+
+    def __settle(
+        self,
+        key: tuple[str, str],
+        sheet: CacheSheet | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Publish the outcome of a claimed sheet fetch to its waiters.
+
+        Args:
+            key: The (sheet_id, sheet_name) pair that was fetched.
+            sheet: The loaded sheet, if the fetch succeeded.
+            error: The error raised by the fetch, if it failed.
+        """
+        with self._add_lock:
+            if sheet is not None:
+                self.sheets[key] = sheet
+            future = self._loading.pop(key)
+
+        if sheet is not None:
+            future.set_result(sheet)
+        else:
+            future.set_exception(error)
+
+    def bulk_load(self, sheets: list[tuple[str, str]]) -> list[CacheSheet]:
+        """Add many sheets, fetching them with one call per spreadsheet.
+
+        All new sheets of a spreadsheet are fetched together with a single
+        values.batchGet. Different spreadsheets are fetched concurrently.
+        Sheets another caller is already fetching are waited for, not
+        fetched again.
+
+        Args:
+            sheets: (sheet_id, sheet_name) pairs to add.
+
+        Returns:
+            The CacheSheet instances, in the order of ``sheets``.
+
+        Raises:
+            APIError: If an API call fails after all retries.
+
+        Example:
+            >>> manager.bulk_load([("1BxiMV...", "Sales"), ("1BxiMV...", "Inventory")])
+        """
+        claimed, waiting = self.__claim_missing(sheets)
+
+        if len(claimed) == 1:
+            self.__load_spreadsheet_sheets(*claimed.popitem())
+        elif claimed:
+            loads = [
+                self._load_executor.submit(
+                    self.__load_spreadsheet_sheets, sheet_id, names
+                )
+                for sheet_id, names in claimed.items()
+            ]
+            # result() re-raises the fetch error, if any
+            for load in loads:
+                load.result()
+
+        for future in waiting:
+            future.result()
+
+        return [self.get_sheet(sheet_id, sheet_name) for sheet_id, sheet_name in sheets]
+
+    def __claim_missing(
+        self, sheets: list[tuple[str, str]]
+    ) -> tuple[dict[str, list[str]], list[Future[CacheSheet]]]:
+        """Claim the sheets not managed yet, grouped by spreadsheet.
+
+        Args:
+            sheets: (sheet_id, sheet_name) pairs.
+
+        Returns:
+            A dictionary mapping each spreadsheet ID to the sheet names this
+            caller must fetch and settle, and the futures of the sheets
+            other callers are already fetching.
+        """
+        claimed: dict[str, list[str]] = {}
+        waiting: list[Future[CacheSheet]] = []
+        with self._add_lock:
+            for key in dict.fromkeys(sheets):
+                if key in self.sheets:
+                    continue
+                future = self._loading.get(key)
+                if future is None:
+                    self._loading[key] = Future()
+                    claimed.setdefault(key[0], []).append(key[1])
+                else:
+                    waiting.append(future)
+
+        return claimed, waiting
+
+    def __load_spreadsheet_sheets(self, sheet_id: str, names: list[str]) -> None:
+        """Create the given sheets of one spreadsheet with one batchGet.
+
+        The sheets must have been claimed by the caller; they are settled
+        whether the fetch succeeds or not.
+
+        Args:
+            sheet_id: The Google Sheets spreadsheet ID.
+            names: Names of claimed sheets of that spreadsheet.
+        """
+        try:
+            values_by_name = CacheSheet.batch_get(sheet_id, names, self.config)
+            loaded = [
+                CacheSheet(
+                    sheet_id,
+                    sheet_name,
+                    self.config,
+                    initial_values=values_by_name[sheet_name],
+                )
+                for sheet_name in names
+            ]
+        except BaseException as e:
+            for sheet_name in names:
+                self.__settle((sheet_id, sheet_name), error=e)
+            raise
+
+        for sheet in loaded:
+            self.__settle((sheet_id, sheet.sheet_name), sheet)
 
     def remove_sheet(self, sheet_id: str, sheet_name: str) -> None:
         """Remove a CacheSheet from the manager.
@@ -128,6 +320,7 @@ class GSheetCacheManager:
         key = (sheet_id, sheet_name)
         if key in self.sheets:
             del self.sheets[key]
+            self._last = None
 
     def clear_all_sheets(self) -> None:
         """Clear all CacheSheet instances from the manager.
@@ -143,6 +336,7 @@ class GSheetCacheManager:
             0
         """
         self.sheets.clear()
+        self._last = None
 
     def get_sheet(self, sheet_id: str, sheet_name: str) -> CacheSheet:
         """Get a CacheSheet instance from the manager.
@@ -163,12 +357,38 @@ class GSheetCacheManager:
             >>> value = sheet.get_value("A1")
         """
         key = (sheet_id, sheet_name)
-        if key not in self.sheets:
+        last = self._last
+        if last is not None and last[0] == key:
+            return last[1]
+
+        sheet = self.sheets.get(key)
+        if sheet is None:
             raise ValueError(f"Sheet not found: {sheet_id} - {sheet_name}")
 
-        sheet = self.sheets[key]
+        self._last = (key, sheet)
         return sheet
 
+    @contextmanager
+    def batch(self, sheet_id: str, sheet_name: str) -> Iterator[CacheSheet]:
+        """Yield a managed CacheSheet for many operations with a single lookup.
+
+        Args:
+            sheet_id: The Google Sheets spreadsheet ID.
+            sheet_name: The name of the sheet/tab.
+
+        Yields:
+            The CacheSheet instance.
+
+        Raises:
+            ValueError: If the sheet is not found in the manager.
+
+        Example:
+            >>> with manager.batch("1BxiMV...", "Sheet1") as sheet:
+            ...     for cell, value in items:
+            ...         sheet.update_value(cell, value)
+        """
+        yield self.get_sheet(sheet_id, sheet_name)
+
     def get_value(self, sheet_id: str, sheet_name: str, cell: str) -> str | None:
         """Get a value from a specific sheet and cell.
 
@@ -191,7 +411,7 @@ class GSheetCacheManager:
             'Hello World'
         """
         sheet = self.get_sheet(sheet_id, sheet_name)
-        return sheet.get_value(cell)
+        return sheet.get_value(_intern(cell))
 
     def update_value(
         self, sheet_id: str, sheet_name: str, cell: str, value: str
@@ -215,7 +435,7 @@ class GSheetCacheManager:
             >>> manager.flush_to_sheet("1BxiMV...", "Sheet1", ["A1"])
         """
         sheet = self.get_sheet(sheet_id, sheet_name)
-        sheet.update_value(cell, value)
+        sheet.update_value(_intern(cell), value)
 
     def flush_to_sheet(self, sheet_id: str, sheet_name: str, cells: list[str]) -> None:
         """Flush updated values to the Google Sheet.
@@ -238,7 +458,155 @@ class GSheetCacheManager:
             >>> manager.flush_to_sheet("1BxiMV...", "Sheet1", ["A1", "B1"])
         """
         sheet = self.get_sheet(sheet_id, sheet_name)
-        sheet.flush_to_sheet(cells)
+        sheet.flush_to_sheet([_intern(cell) for cell in cells])
+
+    def flush_all(self) -> None:
+        """Flush every pending update of every managed sheet.
+
+        Pending updates are grouped by spreadsheet, so all sheets of one
+        spreadsheet are synced with a single values.batchUpdate call.
+
+        Cells updated while the request is in flight stay pending for the
+        next flush.
+
+        Raises:
+            APIError: If an API call fails after all retries. Pending updates
+                of that spreadsheet are kept for the next flush.
+
+        Example:
+            >>> manager.update_value("1BxiMV...", "Sales", "A1", "Value 1")
+            >>> manager.update_value("1BxiMV...", "Inventory", "B1", "Value 2")
+            >>> manager.flush_all()  # One request for both sheets
+        """
+        with self._sync_lock:
+            for sent, data_body in self.__pending_by_spreadsheet():
+                sent[0][0].batch_update(data_body)
+
+                for sheet, cells in sent:
+                    sheet.clear_pending_updates(cells)
+
+    def schedule_flush(self, delay_ms: int = 50) -> None:
+        """Schedule a flush_all() after a short delay.
+
+        Calls made before the delay expires join the already scheduled
+        flush, so updates from many callers are synced together. Updates
+        made while that flush is in flight are left pending, and a flush
+        scheduled meanwhile waits for it before sending them.
+
+        Args:
+            delay_ms: Delay before flushing, in milliseconds.
+
+        Example:
+            >>> manager.update_value("1BxiMV...", "Sheet1", "A1", "Value 1")
+            >>> manager.schedule_flush()
+            >>> manager.update_value("1BxiMV...", "Sheet2", "B1", "Value 2")
+            >>> manager.schedule_flush()  # Joins the first one
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(
+                delay_ms / 1000, self.__run_scheduled_flush
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def __run_scheduled_flush(self) -> None:
+        """Timer callback of schedule_flush()."""
+        with self._flush_lock:
+            self._flush_timer = None
+        try:
+            self.flush_all()
+        except Exception:
+            # Failed updates stay pending for the next flush
+            logger.exception("Scheduled flush failed")
+
+    async def aflush_to_sheet(
+        self, sheet_id: str, sheet_name: str, cells: list[str]
+    ) -> None:
+        """Async version of flush_to_sheet().
+
+        The API call runs in a worker thread, so flushes of different sheets
+        can overlap when awaited together.
+
+        Args:
+            sheet_id: The Google Sheets spreadsheet ID.
+            sheet_name: The name of the sheet/tab.
+            cells: List of cell references in A1 notation to sync.
+
+        Raises:
+            ValueError: If the sheet is not found.
+            APIError: If the API call fails after all retries.
+
+        Example:
+            >>> await asyncio.gather(
+            ...     manager.aflush_to_sheet("1BxiMV...", "Sheet1", ["A1"]),
+            ...     manager.aflush_to_sheet("2CyjNW...", "Sheet1", ["B1"]),
+            ... )
+        """
+        sheet = self.get_sheet(sheet_id, sheet_name)
+        await sheet.aflush_to_sheet([_intern(cell) for cell in cells])
+
+    async def aflush_all(self, *, max_concurrency: int = 8) -> None:
+        """Async version of flush_all() syncing spreadsheets concurrently.
+
+        Args:
+            max_concurrency: Maximum number of spreadsheets synced at once.
+
+        Raises:
+            APIError: If an API call fails after all retries. Pending updates
+                of that spreadsheet are kept for the next flush.
+
+        Example:
+            >>> asyncio.run(manager.aflush_all())
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _flush(
+            sent: list[tuple[CacheSheet, dict[str, str]]], data_body: list[dict]
+        ) -> None:
+            async with semaphore:
+                await asyncio.to_thread(sent[0][0].batch_update, data_body)
+
+            for sheet, cells in sent:
+                sheet.clear_pending_updates(cells)
+
+        await asyncio.gather(
+            *[
+                _flush(sent, data_body)
+                for sent, data_body in self.__pending_by_spreadsheet()
+            ]
+        )
+
+    def __pending_by_spreadsheet(
+        self,
+    ) -> list[tuple[list[tuple[CacheSheet, dict[str, str]]], list[dict]]]:
+        """Collect pending updates grouped by spreadsheet.
+
+        Returns:
+            (sent, data_body) pairs, one per spreadsheet with pending updates,
+            where sent lists each sheet with the cells its entries hold.
+        """
+        sheets_by_id: dict[str, list[CacheSheet]] = {}
+        # Copied, sheets may be added by other threads meanwhile
+        for (sheet_id, _), sheet in list(self.sheets.items()):
+            sheets_by_id.setdefault(sheet_id, []).append(sheet)
+
+        pending = []
+        for sheets in sheets_by_id.values():
+            sent = []
+            data_body = []
+            for sheet in sheets:
+                sheet.flush_cache()
+                cells, entries = sheet.pending_updates()
+                if cells:
+                    sent.append((sheet, cells))
+                    data_body.extend(entries)
+
+            if data_body:
+                pending.append((sent, data_body))
+
+        return pending
 
     def get_range(
         self, sheet_id: str, sheet_name: str, a1_range: str
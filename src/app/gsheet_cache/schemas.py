@@ -1,11 +1,15 @@
 """Data schemas for gsheet-cache.
 
-This module defines Pydantic data models used throughout the gsheet-cache library,
-primarily for representing Google Sheets data structures.
+This module defines lightweight data structures used throughout the gsheet-cache
+library, primarily for representing Google Sheets data structures.
 
 Classes:
     GridRange: Represents a rectangular range of cells in a Google Sheet.
 
+Functions:
+    to_row_slice: Slice selecting the rows of a GridRange.
+    to_column_slice: Slice selecting the columns of a GridRange.
+
 Example:
     >>> from gsheet_cache.schemas import GridRange
     >>> range_obj = GridRange(
@@ -18,15 +22,15 @@ Example:
     Range: rows 0-10
 """
 
-from pydantic import BaseModel, Field
+from typing import NamedTuple
 
 
-class GridRange(BaseModel):
+class GridRange(NamedTuple):
     """Represents a rectangular range of cells in a Google Sheet.
 
-    This class models the GridRange object used by the Google Sheets API to
-    specify cell ranges. All indices are 0-based and the end indices are
-    exclusive (similar to Python slice notation).
+    This immutable named tuple models the GridRange object used by the Google
+    Sheets API to specify cell ranges. All indices are 0-based and the end
+    indices are exclusive (similar to Python slice notation).
 
     Attributes:
         startRowIndex: The start row (inclusive), 0-based. None means start from row 0.
@@ -58,19 +62,35 @@ class GridRange(BaseModel):
         - None values represent unbounded ranges
     """
 
-    startRowIndex: int | None = Field(
-        default=None,
-        description="Start row (inclusive, 0-based). None for first row."
-    )
-    endRowIndex: int | None = Field(
-        default=None,
-        description="End row (exclusive, 0-based). None for last row."
-    )
-    startColumnIndex: int | None = Field(
-        default=None,
-        description="Start column (inclusive, 0-based). None for first column."
-    )
-    endColumnIndex: int | None = Field(
-        default=None,
-        description="End column (exclusive, 0-based). None for last column."
-    )
+    # Start row (inclusive, 0-based). None for first row.
+    startRowIndex: int | None = None
+    # End row (exclusive, 0-based). None for last row.
+    endRowIndex: int | None = None
+    # Start column (inclusive, 0-based). None for first column.
+    startColumnIndex: int | None = None
+    # End column (exclusive, 0-based). None for last column.
+    endColumnIndex: int | None = None
+
+
+def to_row_slice(grid_range: GridRange) -> slice:
+    """Build the slice selecting the rows of a GridRange from a 2D list.
+
+    Args:
+        grid_range: The range to select.
+
+    Returns:
+        A slice usable directly on the outer list, e.g. data[to_row_slice(g)].
+    """
+    return slice(grid_range.startRowIndex, grid_range.endRowIndex)
+
+
+def to_column_slice(grid_range: GridRange) -> slice:
+    """Build the slice selecting the columns of a GridRange from a row list.
+
+    Args:
+        grid_range: The range to select.
+
+    Returns:
+        A slice usable directly on a row, e.g. row[to_column_slice(g)].
+    """
+    return slice(grid_range.startColumnIndex, grid_range.endColumnIndex)
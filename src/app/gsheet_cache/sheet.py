@@ -22,21 +22,150 @@ from typing import Any, MutableMapping
 
 from pathlib import Path
 
+import asyncio
 import csv
+import io
 import random
+import re
 import logging
+import threading
 import time
 
 from gspread import service_account
-from gspread.utils import ValueInputOption, absolute_range_name, a1_to_rowcol
+from requests.adapters import HTTPAdapter
+from gspread.utils import (
+    ValueInputOption,
+    absolute_range_name,
+    rowcol_to_a1,
+)
 from gspread.http_client import HTTPClient
 from gspread.exceptions import APIError
+from gspread.urls import SPREADSHEET_VALUES_BATCH_UPDATE_URL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import GSheetCacheConfig
-from .utils import a1_range_to_grid_range_custom
+from .schemas import to_column_slice, to_row_slice
+from .utils import (
+    a1_range_to_grid_range_custom,
+    cached_a1_to_rowcol,
+    coalesce_cell_rectangles,
+    dir_exists,
+    list_key_files,
+)
 
 logger = logging.getLogger(__name__)
 
+# Cooldown of a rate limited key: base * 2**failures, capped, plus up to 50% jitter
+KEY_COOLDOWN_BASE = 1.0
+KEY_COOLDOWN_MAX = 30.0
+# Matches error messages of rate limit and quota errors
+_RATE_LIMIT_RE = re.compile(r"rate limit|quota|too many requests", re.IGNORECASE)
+
+# Server side errors worth retrying with the same key
+TRANSIENT_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# Retry backoff: base * 2**attempt, capped, plus up to 50% jitter
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Keep-alive connections kept per client; a shared client serves every
+# sheet and worker thread using its key, more than requests' default of 10
+HTTP_POOL_MAXSIZE = 32
+
+# Authenticated clients shared by every CacheSheet, keyed by key file path
+_clients: dict[str, HTTPClient] = {}
+# Per key file path monotonic time before which the key should not be used,
+# and number of consecutive failures driving its cooldown. Shared like the
+# clients, so a key rate limited for one sheet cools down for all of them
+_key_next_ok: dict[str, float] = {}
+_key_fail_count: dict[str, int] = {}
+_clients_lock = threading.Lock()
+
+
+def _client_for(key_path: str) -> HTTPClient:
+    """Get the shared HTTP client for a service account key.
+
+    The key file is parsed and the client created only once per key, so
+    sheets using the same key share one session, its pooled keep-alive
+    connections and one OAuth token.
+
+    Args:
+        key_path: Path to the service account JSON key file.
+
+    Returns:
+        An authenticated HTTPClient instance.
+    """
+    client = _clients.get(key_path)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key_path)
+            if client is None:
+                client = service_account(filename=key_path).http_client
+                client.session.mount(
+                    "https://", HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE)
+                )
+                _clients[key_path] = client
+    return client
+
+
+def _invalidate_client(key_path: str) -> None:
+    """Drop the shared HTTP client of a key, e.g. after an auth failure.
+
+    Args:
+        key_path: Path to the service account JSON key file.
+    """
+    with _clients_lock:
+        _clients.pop(key_path, None)
+
+
+def _key_available_at(key_paths: list[str]) -> list[float]:
+    """Get the monotonic time from which each key may be used again.
+
+    Args:
+        key_paths: Paths to service account JSON key files.
+
+    Returns:
+        The times, in the order of ``key_paths``; 0.0 for keys never failed.
+    """
+    with _clients_lock:
+        return [_key_next_ok.get(key_path, 0.0) for key_path in key_paths]
+
+
+def _cool_down_key(key_path: str) -> float:
+    """Put a key on a cooldown growing exponentially with its failures.
+
+    Args:
+        key_path: Path to the service account JSON key file that failed.
+
+    Returns:
+        The cooldown in seconds.
+    """
+    with _clients_lock:
+        fail_count = _key_fail_count.get(key_path, 0) + 1
+        _key_fail_count[key_path] = fail_count
+        cooldown = min(
+            KEY_COOLDOWN_MAX,
+            KEY_COOLDOWN_BASE * 2 ** (fail_count - 1),
+        ) * (1 + random.random() * 0.5)
+        _key_next_ok[key_path] = time.monotonic() + cooldown
+    return cooldown
+
+
+def _reset_key_cooldowns(key_paths: list[str]) -> None:
+    """Forget the failures and cooldowns of the given keys.
+
+    Args:
+        key_paths: Paths to service account JSON key files.
+    """
+    with _clients_lock:
+        for key_path in key_paths:
+            _key_next_ok.pop(key_path, None)
+            _key_fail_count.pop(key_path, None)
+
 
 class CacheSheet:
     """A cached interface to Google Sheets.
@@ -65,6 +194,7 @@ class CacheSheet:
         sheet_name: str,
         config: GSheetCacheConfig,
         max_retries: int = 3,
+        initial_values: list[list[str]] | None = None,
     ) -> None:
         """Initialize a CacheSheet instance.
 
@@ -73,29 +203,55 @@ class CacheSheet:
             sheet_name: The name of the sheet/tab to cache.
             config: Configuration containing cache and keys directory paths.
             max_retries: Maximum number of retry attempts on API errors.
+            initial_values: Values already fetched for this sheet. When given,
+                the sheet is not fetched again.
 
         Raises:
             FileNotFoundError: If the keys directory does not exist.
             ValueError: If no valid key files are found.
         """
-        self.sheet_id = sheet_id
-        self.config = config
+        self.__init_api(sheet_id, config, max_retries)
         self.sheet_name = sheet_name
+        # Quoted "'Sheet'!" prefix for A1 ranges, computed once
+        self._range_prefix: str = f"{absolute_range_name(sheet_name)}!"
         self.cache_path = config.cache_dir
-        self.max_retries = max_retries
-        self._http_client: HTTPClient | None = None
-        self._current_key_index: int | None = None
-        self._failed_keys: set[int] = set()
         self._cache_data: list[list[str]] | None = None
         self._dirty: bool = False
+        # Cells updated locally but not yet synced, mapped to the value they
+        # were last set to, kept in insertion order
+        self._pending_cells: dict[str, str] = {}
+        # Guards the in-memory data and the pending cells, so a flush running
+        # on another thread never misses or drops a concurrent update
+        self._lock = threading.RLock()
 
         self.__init_cache_file()
+        if initial_values is None:
+            self.__load_values_from_sheet()
+        else:
+            self.__store_values(initial_values)
+
+    def __init_api(
+        self, sheet_id: str, config: GSheetCacheConfig, max_retries: int
+    ) -> None:
+        """Set up the spreadsheet, keys and retry state used for API calls.
+
+        Args:
+            sheet_id: The Google Sheets spreadsheet ID.
+            config: Configuration containing cache and keys directory paths.
+            max_retries: Maximum number of retry attempts on API errors.
+        """
+        self.sheet_id = sheet_id
+        self.config = config
+        self.max_retries = max_retries
+        self._http_client: HTTPClient | None = None
+        self._current_key_index: int | None = None
+        self._current_key_path: Path | None = None
+
         self.__load_keys()
-        self.__load_values_from_sheet()
 
     def __check_keys_dir(self) -> None:
         """Raise an error if the keys directory does not exist."""
-        if not self.config.keys_dir.exists():
+        if not dir_exists(self.config.keys_dir):
             raise FileNotFoundError(
                 f"Keys directory does not exist: {self.config.keys_dir}"
             )
@@ -110,9 +266,7 @@ class CacheSheet:
         self.__check_keys_dir()
 
         keys_dir = self.config.keys_dir
-        self.keys = [
-            f for f in keys_dir.iterdir() if f.is_file() and f.suffix == ".json"
-        ]
+        self.keys = list(list_key_files(keys_dir))
 
         if not self.keys:
             raise ValueError(f"No JSON key files found in {keys_dir}")
@@ -131,7 +285,7 @@ class CacheSheet:
         Raises:
             FileNotFoundError: If the cache directory does not exist.
         """
-        if not self.cache_path.exists():
+        if not dir_exists(self.cache_path):
             raise FileNotFoundError(
                 f"Cache directory does not exist: {self.cache_path}"
             )
@@ -143,46 +297,50 @@ class CacheSheet:
             An authenticated HTTPClient instance.
         """
         if self._http_client is None:
-            self.__select_random_key()
-            assert self._current_key_index is not None
-            key_path = self.keys[self._current_key_index]
+            key_path = self.__select_random_key()
             logger.info(f"Using key: {key_path.name}")
-            self._http_client = service_account(filename=str(key_path)).http_client
+            self._http_client = _client_for(str(key_path))
         return self._http_client
 
-    def __select_random_key(self) -> None:
-        """Select a random key from available keys, excluding failed ones."""
-        available_indices = [
-            i for i in range(len(self.keys)) if i not in self._failed_keys
-        ]
+    def __select_random_key(self) -> Path:
+        """Select a random key among those not cooling down.
+
+        If every key is cooling down, the one available soonest is used.
+
+        Returns:
+            The path of the selected key file.
+        """
+        now = time.monotonic()
+        next_ok = _key_available_at([str(key) for key in self.keys])
+        available_indices = [i for i, t in enumerate(next_ok) if t <= now]
 
         if not available_indices:
-            # Reset failed keys if all have failed
-            logger.warning("All keys have failed, resetting failed keys list")
-            self._failed_keys.clear()
-            available_indices = list(range(len(self.keys)))
+            logger.warning("All keys are cooling down, using the first one available")
+            available_indices = [min(range(len(next_ok)), key=next_ok.__getitem__)]
 
         self._current_key_index = random.choice(available_indices)
+        self._current_key_path = self.keys[self._current_key_index]
+        return self._current_key_path
 
     def __rotate_key(self) -> None:
         """Rotate to a different key after a failure.
 
-        This method marks the current key as failed and selects a new one.
+        This method puts the current key on a cooldown, growing exponentially
+        with its consecutive failures, and selects a new one. The cooldown is
+        shared by every sheet using that key.
         """
-        if self._current_key_index is not None:
-            self._failed_keys.add(self._current_key_index)
+        index = self._current_key_index
+        if index is not None:
+            cooldown = _cool_down_key(str(self.keys[index]))
             logger.warning(
-                f"Marking key {self.keys[self._current_key_index].name} as failed"
+                f"Marking key {self.keys[index].name} as failed for {cooldown:.1f}s"
             )
 
         # Reset HTTP client to force new connection with new key
         self._http_client = None
-        self.__select_random_key()
-
-        assert self._current_key_index is not None
-        new_key_path = self.keys[self._current_key_index]
+        new_key_path = self.__select_random_key()
         logger.info(f"Rotating to new key: {new_key_path.name}")
-        self._http_client = service_account(filename=str(new_key_path)).http_client
+        self._http_client = _client_for(str(new_key_path))
 
     def __is_rate_limit_error(self, error: APIError) -> bool:
         """Check if an API error is due to rate limiting.
@@ -193,28 +351,46 @@ class CacheSheet:
         Returns:
             True if the error is rate limit related, False otherwise.
         """
-        # Check for common rate limit status codes
-        if hasattr(error, "response") and error.response is not None:
-            status_code = error.response.status_code
-            # 429 = Too Many Requests, 403 can also indicate quota exceeded
-            if status_code in (429, 403):
-                return True
-
-            # Check error message for rate limit keywords
-            error_message = str(error).lower()
-            rate_limit_keywords = [
-                "rate limit",
-                "quota",
-                "too many requests",
-                "user rate limit",
-            ]
-            return any(keyword in error_message for keyword in rate_limit_keywords)
+        if error.response is None:
+            return False
+
+        # 429 = Too Many Requests, no need to look at the message
+        if error.response.status_code == 429:
+            return True
+
+        # 403 is also used for quota exceeded, along with permission errors,
+        # so it is told apart by the message like any other status
+        return _RATE_LIMIT_RE.search(str(error)) is not None
+
+    def __retry_delay(self, error: APIError, attempt: int) -> float:
+        """Compute the wait before retrying a rate limited call.
+
+        A Retry-After header given in seconds wins; otherwise the delay grows
+        exponentially with the attempt, capped, with jitter so that clients
+        limited together do not retry in lockstep.
+
+        Args:
+            error: The rate limit APIError.
+            attempt: The 0-based attempt that failed.
 
-        return False
+        Returns:
+            The delay in seconds.
+        """
+        if error.response is not None:
+            retry_after = error.response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                return float(retry_after)
+
+        return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt) * (
+            1 + random.random() * 0.5
+        )
 
     def __execute_with_retry(self, operation, *args, **kwargs):
         """Execute an operation with automatic retry and key rotation on failure.
 
+        Rate limit errors rotate to another key before retrying; transient
+        server errors (5xx) are retried with the same key.
+
         Args:
             operation: The function to execute.
             *args: Positional arguments for the operation.
@@ -242,16 +418,35 @@ class CacheSheet:
                         # Rotate key and retry
                         self.__rotate_key()
 
-                        # Exponential backoff
-                        wait_time = 2**attempt
-                        logger.info(f"Waiting {wait_time}s before retry...")
+                        wait_time = self.__retry_delay(e, attempt)
+                        logger.info(f"Waiting {wait_time:.2f}s before retry...")
                         time.sleep(wait_time)
                     else:
                         logger.error("Max retries reached, all keys exhausted")
                         raise
+                elif (
+                    e.response is not None
+                    and e.response.status_code in TRANSIENT_STATUS_CODES
+                    and attempt < self.max_retries - 1
+                ):
+                    # Server hiccup, not the key's fault: back off and retry as is
+                    wait_time = self.__retry_delay(e, attempt)
+                    logger.warning(
+                        f"Transient API error on attempt {attempt + 1}/{self.max_retries}, "
+                        f"retrying in {wait_time:.2f}s: {e}"
+                    )
+                    time.sleep(wait_time)
                 else:
                     # Non-rate-limit error, re-raise immediately
                     logger.error(f"API error (non-rate-limit): {e}")
+                    if (
+                        e.response is not None
+                        and e.response.status_code == 401
+                        and self._current_key_path is not None
+                    ):
+                        # Credentials went bad, authenticate again next time
+                        _invalidate_client(str(self._current_key_path))
+                        self._http_client = None
                     raise
 
         # Should not reach here, but just in case
@@ -261,6 +456,9 @@ class CacheSheet:
     def __read_cache_data(self) -> list[list[str]]:
         """Read all data from the cache file with in-memory caching.
 
+        The in-memory data is seeded when values are loaded from the sheet,
+        so the file is only parsed if that copy was dropped.
+
         Returns:
             A 2D list of strings representing the cached sheet data.
 
@@ -282,14 +480,22 @@ class CacheSheet:
         Args:
             data: A 2D list of strings to write to the cache.
         """
-        with self.cache_file.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerows(data)
+        self.__write_csv(data)
 
         # Update in-memory cache after writing to disk
         self._cache_data = data
         self._dirty = False
 
+    def __write_csv(self, data: list[list[str]]) -> None:
+        """Serialize rows to CSV in memory and write the cache file at once.
+
+        Args:
+            data: A 2D list of strings to write to the cache file.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(data)
+        self.cache_file.write_text(buffer.getvalue(), encoding="utf-8", newline="")
+
     def __ensure_cell_exists(self, data: list[list[str]], row: int, col: int) -> None:
         """Ensure the data structure is large enough for the given cell.
 
@@ -312,7 +518,7 @@ class CacheSheet:
         Returns:
             A tuple of (row_index, col_index) in 0-based indexing.
         """
-        row, col = a1_to_rowcol(cell)
+        row, col = cached_a1_to_rowcol(cell)
         return row - 1, col - 1
 
     def __load_values_from_sheet(self):
@@ -330,16 +536,78 @@ class CacheSheet:
         if not res:
             raise ValueError("Failed to fetch data from Google Sheet")
 
+        self.__store_values(res.get("values", []))
+
+    def __store_values(self, values: list[list[str]]) -> None:
+        """Write fetched values to the cache file and the in-memory cache.
+
+        Args:
+            values: A 2D list of strings as returned by the API.
+        """
         self.__init_cache_file()
-        with self.cache_file.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            for row in res["values"]:
-                writer.writerow(row)
+        self.__write_csv(values)
 
-        # Clear in-memory cache to force reload from new file
-        self._cache_data = None
+        # The fetched rows already are the in-memory cache, no need to
+        # parse back the file just written
+        self._cache_data = values
         self._dirty = False
 
+    @classmethod
+    def batch_get(
+        cls,
+        sheet_id: str,
+        sheet_names: list[str],
+        config: GSheetCacheConfig,
+        max_retries: int = 3,
+    ) -> dict[str, list[list[str]]]:
+        """Fetch the values of several sheets of a spreadsheet in one API call.
+
+        No sheet has to be loaded first: a key is picked and rotated on
+        failure exactly as for a CacheSheet, so a spreadsheet never cached
+        before is fetched with a single values.batchGet.
+
+        Args:
+            sheet_id: The Google Sheets spreadsheet ID.
+            sheet_names: Names of the sheets/tabs to fetch.
+            config: Configuration containing cache and keys directory paths.
+            max_retries: Maximum number of retry attempts on API errors.
+
+        Returns:
+            A dictionary mapping each sheet name to its values.
+
+        Raises:
+            FileNotFoundError: If the keys directory does not exist.
+            ValueError: If no valid key files are found.
+            APIError: If the API call fails after all retries.
+
+        Example:
+            >>> values = CacheSheet.batch_get("1BxiMV...", ["Sales", "Stock"], config)
+            >>> sheet = CacheSheet(
+            ...     "1BxiMV...", "Sales", config, initial_values=values["Sales"]
+            ... )
+        """
+        # Only the API state is needed, there is no cache file behind it
+        fetcher = cls.__new__(cls)
+        fetcher.__init_api(sheet_id, config, max_retries)
+
+        def _fetch():
+            gsheet_http_client = fetcher.__get_http_client()
+            return gsheet_http_client.values_batch_get(
+                id=sheet_id,
+                ranges=[absolute_range_name(name) for name in sheet_names],
+            )
+
+        res = fetcher.__execute_with_retry(_fetch)
+
+        if not res:
+            raise ValueError("Failed to fetch data from Google Sheet")
+
+        # valueRanges come back in the order of the requested ranges
+        return {
+            name: value_range.get("values", [])
+            for name, value_range in zip(sheet_names, res.get("valueRanges", []))
+        }
+
     def get_value(self, cell: str) -> str | None:
         """Get the value of a specific cell from the cache.
 
@@ -377,14 +645,15 @@ class CacheSheet:
         Raises:
             FileNotFoundError: If the cache directory does not exist.
         """
-        data = self.__read_cache_data()
         row, col = self.__a1_to_indices(cell)
+        with self._lock:
+            data = self.__read_cache_data()
+            self.__ensure_cell_exists(data, row, col)
+            data[row][col] = value
 
-        self.__ensure_cell_exists(data, row, col)
-        data[row][col] = value
-
-        # Mark cache as dirty but don't write to disk yet
-        self._dirty = True
+            # Mark cache as dirty but don't write to disk yet
+            self._dirty = True
+            self._pending_cells[cell] = value
 
     def flush_cache(self) -> None:
         """Write in-memory cache to disk if dirty.
@@ -397,64 +666,170 @@ class CacheSheet:
         Raises:
             FileNotFoundError: If the cache directory does not exist.
         """
-        if self._dirty and self._cache_data is not None:
-            self.__write_cache_data(self._cache_data)
+        with self._lock:
+            if self._dirty and self._cache_data is not None:
+                self.__write_cache_data(self._cache_data)
 
-    def flush_to_sheet(self, cells: list[str]) -> dict[str, Any] | None:
-        """Flush the cached values back to the Google Sheet.
+    def build_update_data(self, cells: list[str]) -> list[dict[str, Any]]:
+        """Build the values.batchUpdate data entries for the given cells.
 
-        This method automatically flushes pending changes to disk before
-        syncing to the Google Sheet.
+        Adjacent cells are merged into rectangular ranges, so the request
+        carries as few ranges as possible. Ranges are qualified with the
+        sheet name, so entries from several sheets of the same spreadsheet
+        can be sent in one request.
 
         Args:
-            cells: List of cell references in A1 notation to sync (e.g., ["A1", "B5"]).
+            cells: List of cell references in A1 notation (e.g., ["A1", "B5"]).
 
         Returns:
-            The API response from the batch update operation.
+            A list of {"range": ..., "values": [[...]]} dictionaries.
 
         Raises:
             FileNotFoundError: If the cache directory does not exist.
-            APIError: If the API call fails after all retries.
         """
-        # Flush in-memory changes to disk first
-        self.flush_cache()
-
-        data = self.__read_cache_data()
-
         data_body = []
-        for cell in cells:
-            row, col = self.__a1_to_indices(cell)
-
-            self.__ensure_cell_exists(data, row, col)
+        for start_row, start_col, end_row, end_col in coalesce_cell_rectangles(cells):
+            values = []
+            with self._lock:
+                data = self.__read_cache_data()
+                for row in range(start_row - 1, end_row):
+                    self.__ensure_cell_exists(data, row, end_col - 1)
+                    values.append(data[row][start_col - 1 : end_col])
+
+            a1_range = rowcol_to_a1(start_row, start_col)
+            if (start_row, start_col) != (end_row, end_col):
+                a1_range = f"{a1_range}:{rowcol_to_a1(end_row, end_col)}"
 
             data_body.append(
                 {
-                    "range": cell,
-                    "values": [[data[row][col]]],
+                    "range": self._range_prefix + a1_range,
+                    "values": values,
                 }
             )
 
-        value_input_option = ValueInputOption.raw
+        return data_body
+
+    def pending_updates(self) -> tuple[dict[str, str], list[dict[str, Any]]]:
+        """Get the batchUpdate data entries for all cells updated since the last sync.
+
+        The pending cells and their values are read together, so the entries
+        hold exactly the values of the returned snapshot.
+
+        Returns:
+            The pending cells mapped to their value, to pass to
+            clear_pending_updates() once sent, and a list of
+            {"range": ..., "values": [[...]]} dictionaries.
+        """
+        with self._lock:
+            sent = dict(self._pending_cells)
+            return sent, self.build_update_data(list(sent))
+
+    def clear_pending_updates(self, sent: dict[str, str | None]) -> None:
+        """Forget the pending cells that were synced.
+
+        A cell updated again since it was sent holds a newer value, so it
+        stays pending for the next sync.
+
+        Args:
+            sent: The synced cells mapped to the value they were sent with,
+                as returned by pending_updates().
+        """
+        with self._lock:
+            pending = self._pending_cells
+            for cell, value in sent.items():
+                if cell in pending and pending[cell] == value:
+                    del pending[cell]
 
-        for values in data_body:
-            values["range"] = absolute_range_name(self.sheet_name, values["range"])
+    def batch_update(self, data_body: list[dict[str, Any]]) -> dict[str, Any] | None:
+        """Send prepared data entries to this spreadsheet in a single API call.
+
+        Args:
+            data_body: Entries as returned by build_update_data(). They may
+                target any sheet of this spreadsheet.
+
+        Returns:
+            The API response from the batch update operation.
 
+        Raises:
+            APIError: If the API call fails after all retries.
+        """
         body: MutableMapping[str, Any] = {
-            "valueInputOption": value_input_option,
+            "valueInputOption": ValueInputOption.raw,
             "includeValuesInResponse": None,
             "responseValueRenderOption": None,
             "responseDateTimeRenderOption": None,
             "data": data_body,
         }
 
-        def _update():
-            gsheet_http_client = self.__get_http_client()
-            return gsheet_http_client.values_batch_update(self.sheet_id, body=body)
+        if orjson is None:
+
+            def _update():
+                gsheet_http_client = self.__get_http_client()
+                return gsheet_http_client.values_batch_update(self.sheet_id, body=body)
+
+        else:
+            # Serialize once for all attempts, with orjson rather than the
+            # stdlib json used by requests
+            payload = orjson.dumps(body)
+
+            def _update():
+                gsheet_http_client = self.__get_http_client()
+                response = gsheet_http_client.request(
+                    "post",
+                    SPREADSHEET_VALUES_BATCH_UPDATE_URL % self.sheet_id,
+                    data=payload,
+                    headers={"Content-Type": "application/json"},
+                )
+                return orjson.loads(response.content)
+
+        return self.__execute_with_retry(_update)
+
+    def flush_to_sheet(self, cells: list[str]) -> dict[str, Any] | None:
+        """Flush the cached values back to the Google Sheet.
+
+        This method automatically flushes pending changes to disk before
+        syncing to the Google Sheet.
+
+        Args:
+            cells: List of cell references in A1 notation to sync (e.g., ["A1", "B5"]).
+
+        Returns:
+            The API response from the batch update operation.
+
+        Raises:
+            FileNotFoundError: If the cache directory does not exist.
+            APIError: If the API call fails after all retries.
+        """
+        # Flush in-memory changes to disk first
+        self.flush_cache()
+
+        with self._lock:
+            sent = {cell: self._pending_cells.get(cell) for cell in cells}
+            data_body = self.build_update_data(cells)
 
-        response = self.__execute_with_retry(_update)
+        response = self.batch_update(data_body)
+        self.clear_pending_updates(sent)
 
         return response
 
+    async def aflush_to_sheet(self, cells: list[str]) -> dict[str, Any] | None:
+        """Async version of flush_to_sheet().
+
+        The API call runs in a worker thread, so several sheets can be
+        flushed concurrently with asyncio.gather().
+
+        Args:
+            cells: List of cell references in A1 notation to sync (e.g., ["A1", "B5"]).
+
+        Returns:
+            The API response from the batch update operation.
+
+        Raises:
+            FileNotFoundError: If the cache directory does not exist.
+            APIError: If the API call fails after all retries.
+        """
+        return await asyncio.to_thread(self.flush_to_sheet, cells)
+
     def get_range(self, a1_range: str) -> list[list[str]]:
         """Get a range of values from the cache.
 
@@ -472,23 +847,22 @@ class CacheSheet:
 
         grid_range = a1_range_to_grid_range_custom(a1_range)
 
+        start_row = grid_range.startRowIndex or 0
+        end_row = grid_range.endRowIndex or len(data)
+        start_col = grid_range.startColumnIndex or 0
+
+        rows = data[to_row_slice(grid_range)]
+        # Rows past the end of the cached data still yield (empty) rows
+        rows.extend([] for _ in range(end_row - start_row - len(rows)))
+
         result = []
-        for r in range(
-            grid_range.startRowIndex or 0,
-            grid_range.endRowIndex or len(data),
-        ):
-            row_data = []
-            for c in range(
-                grid_range.startColumnIndex or 0,
-                grid_range.endColumnIndex or (len(data[r]) if r < len(data) else 0),
-            ):
-                try:
-                    value = data[r][c]
-                    if value == "":
-                        value = None
-                    row_data.append(value)
-                except IndexError:
-                    row_data.append(None)
+        for row in rows:
+            end_col = grid_range.endColumnIndex or len(row)
+            row_data = [
+                None if value == "" else value
+                for value in row[to_column_slice(grid_range)]
+            ]
+            row_data.extend([None] * (end_col - start_col - len(row_data)))
             result.append(row_data)
 
         return result
@@ -499,7 +873,7 @@ class CacheSheet:
         This can be called to give previously failed keys another chance,
         for example after a cooldown period or when you know quota has reset.
         """
-        self._failed_keys.clear()
+        _reset_key_cooldowns([str(key) for key in self.keys])
         logger.info("Failed keys list has been reset")
 
     def get_key_status(self) -> dict[str, Any]:
@@ -509,18 +883,20 @@ class CacheSheet:
             A dictionary containing:
             - total_keys: Total number of available keys
             - current_key: Name of the currently active key (or None)
-            - failed_keys: List of failed key names
+            - failed_keys: List of key names still cooling down after a failure
             - available_keys: Number of keys still available
         """
         current_key_name = None
-        if self._current_key_index is not None:
-            current_key_name = self.keys[self._current_key_index].name
+        if self._current_key_path is not None:
+            current_key_name = self._current_key_path.name
 
-        failed_key_names = [self.keys[i].name for i in self._failed_keys]
+        now = time.monotonic()
+        next_ok = _key_available_at([str(key) for key in self.keys])
+        failed_key_names = [key.name for key, t in zip(self.keys, next_ok) if t > now]
 
         return {
             "total_keys": len(self.keys),
             "current_key": current_key_name,
             "failed_keys": failed_key_names,
-            "available_keys": len(self.keys) - len(self._failed_keys),
+            "available_keys": len(self.keys) - len(failed_key_names),
         }
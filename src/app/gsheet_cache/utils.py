@@ -4,7 +4,12 @@ This module provides helper functions for working with Google Sheets data,
 particularly for converting between different range notation formats.
 
 Functions:
-    a1_range_to_grid_range_custom: Convert A1 notation to GridRange objects.
+    a1_range_to_grid_range_custom: Memoized conversion of A1 notation to GridRange objects.
+    cached_a1_to_rowcol: Memoized conversion of a cell reference to (row, col).
+    coalesce_cell_rectangles: Merge single cells into covering rectangles.
+    dir_exists: Check a directory once per process.
+    ensure_dir: Create a directory once per process.
+    list_key_files: List the JSON key files of a directory once per process.
 
 Example:
     >>> from gsheet_cache.utils import a1_range_to_grid_range_custom
@@ -13,11 +18,29 @@ Example:
     Rows: 0-10
 """
 
-from gspread.utils import a1_range_to_grid_range
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol
 
 from .schemas import GridRange
 
+# Bounded cell ranges ("A1", "A1:B10") and full column ranges ("A:A", "B:E"),
+# the shapes handled without going through gspread
+_A1_CELLS_RE = re.compile(r"([A-Za-z]+)([1-9]\d*)(?::([A-Za-z]+)([1-9]\d*))?")
+_A1_COLUMNS_RE = re.compile(r"([A-Za-z]+)(?::([A-Za-z]+))?")
+
+# Directories already seen to exist. Deleting one afterwards is not detected,
+# which is fine since cache and keys directories live for the whole process.
+_PROBED_PATHS: set[Path] = set()
+
+# JSON key files found per keys directory, shared by every sheet
+_KEY_FILES: dict[Path, tuple[Path, ...]] = {}
+
 
+@lru_cache(maxsize=4096)
 def a1_range_to_grid_range_custom(a1_range: str) -> GridRange:
     """Convert an A1 notation range string to a GridRange object.
 
@@ -63,7 +86,164 @@ def a1_range_to_grid_range_custom(a1_range: str) -> GridRange:
 
     Note:
         The returned GridRange uses 0-based indexing with exclusive end indices,
-        consistent with the Google Sheets API specification.
+        consistent with the Google Sheets API specification. Cell and full
+        column ranges are parsed directly; other shapes go through gspread.
+        Results are cached, GridRange being immutable.
     """
+    m = _A1_CELLS_RE.fullmatch(a1_range)
+    if m is not None:
+        start_col, start_row, end_col, end_row = m.groups()
+        col_1 = _column_number(start_col)
+        row_1 = int(start_row)
+        col_2 = _column_number(end_col) if end_col else col_1
+        row_2 = int(end_row) if end_row else row_1
+        return GridRange(
+            startRowIndex=min(row_1, row_2) - 1,
+            endRowIndex=max(row_1, row_2),
+            startColumnIndex=min(col_1, col_2) - 1,
+            endColumnIndex=max(col_1, col_2),
+        )
+
+    m = _A1_COLUMNS_RE.fullmatch(a1_range)
+    if m is not None:
+        start_col, end_col = m.groups()
+        col_1 = _column_number(start_col)
+        col_2 = _column_number(end_col) if end_col else col_1
+        return GridRange(
+            startColumnIndex=min(col_1, col_2) - 1,
+            endColumnIndex=max(col_1, col_2),
+        )
+
     grid_range_dict = a1_range_to_grid_range(a1_range)
     return GridRange(**grid_range_dict)
+
+
+def _column_number(letters: str) -> int:
+    """Convert column letters to a 1-based column number (e.g., "AB" -> 28)."""
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + ord(char) - 64
+    return number
+
+
+@lru_cache(maxsize=4096)
+def cached_a1_to_rowcol(cell: str) -> tuple[int, int]:
+    """Convert a cell reference in A1 notation to 1-based (row, col).
+
+    Sheets are addressed through a small, fixed set of cells, so the
+    parsed result is cached for the whole session.
+
+    Args:
+        cell: A cell reference in A1 notation (e.g., "A1", "B5").
+
+    Returns:
+        A tuple of (row, col) in 1-based indexing.
+
+    Example:
+        >>> cached_a1_to_rowcol("B5")
+        (5, 2)
+    """
+    return a1_to_rowcol(cell)
+
+
+def coalesce_cell_rectangles(cells: list[str]) -> list[tuple[int, int, int, int]]:
+    """Merge single cell references into rectangles covering exactly those cells.
+
+    Cells are grouped into runs of consecutive columns per row, then runs with
+    the same column span on consecutive rows are stacked into one rectangle.
+    Duplicate cells are ignored.
+
+    Args:
+        cells: Cell references in A1 notation (e.g., ["A1", "B1", "A2"]).
+
+    Returns:
+        A list of (start_row, start_col, end_row, end_col) tuples with 1-based,
+        inclusive indices, ordered by their top-left cell.
+
+    Example:
+        >>> coalesce_cell_rectangles(["A1", "A2", "B1", "B2", "D5"])
+        [(1, 1, 2, 2), (5, 4, 5, 4)]
+    """
+    positions = sorted({cached_a1_to_rowcol(cell) for cell in cells})
+
+    # Runs of consecutive columns within each row
+    runs: list[tuple[int, int, int]] = []
+    for row, col in positions:
+        if runs and runs[-1][0] == row and runs[-1][2] == col - 1:
+            runs[-1] = (row, runs[-1][1], col)
+        else:
+            runs.append((row, col, col))
+
+    # Stack runs with identical column spans on consecutive rows
+    rectangles: list[list[int]] = []
+    open_by_span: dict[tuple[int, int], list[int]] = {}
+    for row, start_col, end_col in runs:
+        rectangle = open_by_span.get((start_col, end_col))
+        if rectangle is not None and rectangle[2] == row - 1:
+            rectangle[2] = row
+        else:
+            rectangle = [row, start_col, row, end_col]
+            rectangles.append(rectangle)
+            open_by_span[(start_col, end_col)] = rectangle
+
+    return sorted(
+        (start_row, start_col, end_row, end_col)
+        for start_row, start_col, end_row, end_col in rectangles
+    )
+
+
+def dir_exists(path: Path) -> bool:
+    """Check whether a directory exists, hitting the filesystem only until it does.
+
+    Args:
+        path: The directory to check.
+
+    Returns:
+        True if the directory exists or was already seen to exist.
+    """
+    if path in _PROBED_PATHS:
+        return True
+
+    if path.exists():
+        _PROBED_PATHS.add(path)
+        return True
+
+    return False
+
+
+def ensure_dir(path: Path) -> None:
+    """Create a directory (and its parents) unless it was already seen to exist.
+
+    Args:
+        path: The directory to create.
+    """
+    if path in _PROBED_PATHS:
+        return
+
+    path.mkdir(parents=True, exist_ok=True)
+    _PROBED_PATHS.add(path)
+
+
+def list_key_files(keys_dir: Path) -> tuple[Path, ...]:
+    """List the JSON key files of a directory, scanning it only once.
+
+    An empty result is not remembered, so keys added later are still found.
+
+    Args:
+        keys_dir: The directory containing service account JSON keys.
+
+    Returns:
+        The paths of the ``.json`` files in the directory.
+    """
+    key_files = _KEY_FILES.get(keys_dir)
+    if key_files is None:
+        with os.scandir(keys_dir) as entries:
+            key_files = tuple(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+        if key_files:
+            _KEY_FILES[keys_dir] = key_files
+
+    return key_files
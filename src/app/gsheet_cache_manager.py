@@ -15,7 +15,4 @@ gsheet_cache_manager = GSheetCacheManager(config=gsheet_cache_config)
 def initialize_gsheet_cache_manager() -> None:
     global gsheet_cache_manager
 
-    gsheet_cache_manager.add_sheet(
-        sheet_id=config.SHEET_ID,
-        sheet_name=config.SHEET_NAME,
-    )
+    gsheet_cache_manager.bulk_load([(config.SHEET_ID, config.SHEET_NAME)])
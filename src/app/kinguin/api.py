@@ -1,23 +1,78 @@
 from datetime import datetime
 import logging
+import random
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
-from app.shared.consts import KINGUIN_TOKEN_BASE_URL, KINGUIN_API_BASE_URL
-from .models import Offer, PriceBase
+from app.shared.consts import (
+    COMMISSION_RULE_CACHE_TTL,
+    KINGUIN_TOKEN_BASE_URL,
+    KINGUIN_API_BASE_URL,
+)
+from .models import CommissionRule, Offer, PriceBase
 from app.shared.exceptions import ApiError
 from app import config
 from app.shared.decorators import retry_on_fail
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections to the Kinguin API, enough for every worker thread
+# and the background requests of the processes
+HTTP_POOL_MAXSIZE = 32
+
+
+# Retry delays of Kinguin requests: fixed for transient failures, backing off
+# up to the cap (or following Retry-After) when rate limited
+RETRY_DELAY = 2
+RATE_LIMIT_MAX_DELAY = 30
+
+
+def _http_error(
+    exception: Exception,
+) -> HTTPError | None:
+    # ApiError is raised while handling the HTTPError, which stays as its context
+    http_error = exception if isinstance(exception, HTTPError) else exception.__context__
+    if not isinstance(http_error, HTTPError) or http_error.response is None:
+        return None
+    return http_error
+
+
+def is_client_error(
+    exception: Exception,
+) -> bool:
+    # 4xx other than 401/429 will fail the same way on retry
+    http_error = _http_error(exception)
+    if http_error is None:
+        return False
+    status_code = http_error.response.status_code
+    return 400 <= status_code < 500 and status_code not in (401, 429)
+
+
+def retry_delay(
+    exception: Exception,
+    attempt: int,
+) -> float:
+    http_error = _http_error(exception)
+    if http_error is None or http_error.response.status_code != 429:
+        return RETRY_DELAY
+
+    retry_after = http_error.response.headers.get("Retry-After")
+    if retry_after is not None and retry_after.isdigit():
+        return float(retry_after)
+    return min(RATE_LIMIT_MAX_DELAY, RETRY_DELAY * 2**attempt) + random.uniform(0, 1)
+
 
 class Token:
     def __init__(
         self,
+        session: requests.Session,
     ) -> None:
+        self.session = session
+
         # Init access token
-        res = requests.post(
+        res = self.session.post(
             KINGUIN_TOKEN_BASE_URL,
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -53,7 +108,7 @@ class Token:
     def refresh_token(
         self,
     ) -> None:
-        res = requests.post(
+        res = self.session.post(
             KINGUIN_TOKEN_BASE_URL,
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -95,7 +150,12 @@ class KinguinClient:
     def __init__(
         self,
     ):
-        self.token: Token = Token()
+        # One pooled session, so requests reuse warm TLS connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE))
+        self.token: Token = Token(self.session)
+        # Commission rule of each fetched offer, as offer_id -> (monotonic time, rule)
+        self._commission_rules: dict[str, tuple[float, CommissionRule]] = {}
 
     def get_offer_without_model(
         self,
@@ -108,14 +168,19 @@ class KinguinClient:
             "Content-Type": "application/json",
         }
 
-        res = requests.get(
+        res = self.session.get(
             f"{KINGUIN_API_BASE_URL}/api/v1/offers/{offer_id}", headers=headers
         )
         res.raise_for_status()
 
         return res.json()
 
-    @retry_on_fail(max_retries=5, sleep_interval=2)
+    @retry_on_fail(
+        max_retries=5,
+        sleep_interval=RATE_LIMIT_MAX_DELAY,
+        delay_fn=retry_delay,
+        give_up=is_client_error,
+    )
     def get_offer(
         self,
         offer_id: str,
@@ -127,16 +192,37 @@ class KinguinClient:
             "Content-Type": "application/json",
         }
 
-        res = requests.get(
+        res = self.session.get(
             f"{KINGUIN_API_BASE_URL}/api/v1/offers/{offer_id}",
             headers=headers,
             timeout=60,
         )
         res.raise_for_status()
 
-        return Offer.model_validate(res.json())
+        offer = Offer.model_validate_json(res.content)
+        self._commission_rules[offer_id] = (time.monotonic(), offer.commissionRule)
+        return offer
 
-    @retry_on_fail(max_retries=5, sleep_interval=2)
+    def get_commission_rule(
+        self,
+        offer_id: str,
+    ) -> CommissionRule:
+        # Rules rarely change, reuse the one of a recently fetched offer
+        cached = self._commission_rules.get(offer_id)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < COMMISSION_RULE_CACHE_TTL
+        ):
+            return cached[1]
+
+        return self.get_offer(offer_id=offer_id).commissionRule
+
+    @retry_on_fail(
+        max_retries=5,
+        sleep_interval=RATE_LIMIT_MAX_DELAY,
+        delay_fn=retry_delay,
+        give_up=is_client_error,
+    )
     def get_offers(
         self,
     ):
@@ -147,14 +233,19 @@ class KinguinClient:
             "Content-Type": "application/json",
         }
 
-        res = requests.get(
+        res = self.session.get(
             f"{KINGUIN_API_BASE_URL}/api/v1/offers", headers=headers, timeout=60
         )
         res.raise_for_status()
 
         return res.json()
 
-    @retry_on_fail(max_retries=5, sleep_interval=2)
+    @retry_on_fail(
+        max_retries=5,
+        sleep_interval=RATE_LIMIT_MAX_DELAY,
+        delay_fn=retry_delay,
+        give_up=is_client_error,
+    )
     def update_offer(
         self,
         offer_id: str,
@@ -177,7 +268,7 @@ class KinguinClient:
         if min_quantity:
             payload["minQuantity"] = min_quantity
 
-        res = requests.patch(
+        res = self.session.patch(
             f"{KINGUIN_API_BASE_URL}/api/v1/offers/{offer_id}",
             headers=headers,
             json=payload,
@@ -1,7 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
-class PriceBase(BaseModel):
+class KinguinModel(BaseModel):
+    # Parsed payloads are read-only, and unknown fields are dropped
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class PriceBase(KinguinModel):
     amount: int
     currency: str
 
@@ -14,14 +19,14 @@ class PriceBase(BaseModel):
 #     pass
 
 
-class CommissionRule(BaseModel):
+class CommissionRule(KinguinModel):
     id: str
     ruleName: str
     fixedAmount: int
     percentValue: int
 
 
-class Offer(BaseModel):
+class Offer(KinguinModel):
     id: str
     productId: str
     name: str
@@ -1,11 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.shared.consts import API_VS_REAL_PRICE_CONVERT_RATE
 from app.kinguin.models import CommissionRule
 
+from .utils import price_to_priceiwtr, priceiwtr_to_price
+
 
 class PriceBase(BaseModel):
-    pass
+    # Prices are value objects, every conversion builds a new one
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
 
 class APIPrice(PriceBase):
@@ -31,14 +34,7 @@ class PriceCustomerPay(APIPrice):
         self,
         commission_rule: CommissionRule,
     ) -> "PriceIWTR":
-        priceiwtr = int(
-            round(
-                (self.amount - commission_rule.fixedAmount)
-                * 100
-                / (100 + commission_rule.percentValue),
-                0,
-            )
-        )
+        priceiwtr = price_to_priceiwtr(self.amount, commission_rule)
         return PriceIWTR(amount=priceiwtr)
 
 
@@ -47,13 +43,7 @@ class PriceIWTR(APIPrice):
         self,
         commission_rule: CommissionRule,
     ) -> PriceCustomerPay:
-        price_customer_pay = int(
-            round(
-                self.amount * (100 + commission_rule.percentValue) / 100
-                + commission_rule.fixedAmount,
-                0,
-            )
-        )
+        price_customer_pay = priceiwtr_to_price(self.amount, commission_rule)
         return PriceCustomerPay(amount=price_customer_pay)
 
 
@@ -65,10 +55,7 @@ class APIUnitPrice(UnitPriceBase):
     def to_real_unit_price(
         self,
     ) -> "RealUnitPrice":
-        if isinstance(self.amount, int):
-            real_unit_price: float = float(self.amount) / API_VS_REAL_PRICE_CONVERT_RATE
-        else:
-            real_unit_price: float = self.amount / API_VS_REAL_PRICE_CONVERT_RATE
+        real_unit_price: float = self.amount / API_VS_REAL_PRICE_CONVERT_RATE
 
         return RealUnitPrice(amount=real_unit_price)
 
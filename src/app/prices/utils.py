@@ -18,12 +18,9 @@ def priceiwtr_to_price(
     priceiwtr: int,
     commission_rule: CommissionRule,
 ) -> int:
-    return int(
-        round(
-            priceiwtr * (100 + commission_rule.percentValue) / 100
-            + commission_rule.fixedAmount,
-            0,
-        )
+    return round(
+        priceiwtr * (100 + commission_rule.percentValue) / 100
+        + commission_rule.fixedAmount
     )
 
 
@@ -44,13 +41,8 @@ def price_to_priceiwtr(
     price: int,
     commission_rule: CommissionRule,
 ) -> int:
-    return int(
-        round(
-            (price - commission_rule.fixedAmount)
-            * 100
-            / (100 + commission_rule.percentValue),
-            0,
-        )
+    return round(
+        (price - commission_rule.fixedAmount) * 100 / (100 + commission_rule.percentValue)
     )
 
 
@@ -75,11 +67,24 @@ def unit_price_to_priceiwtr(
     )
 
 
+def real_unit_price_per_unit_stock_to_prices(
+    real_unit_price_per_unit_stock: float,
+    unit_stock: int,
+    min_quantity_per_order: int,
+    commission_rule: CommissionRule,
+) -> tuple[int, int]:
+    # Same arithmetic as RealUnitPricePerUnitStock -> APIUnitPrice
+    # -> PriceCustomerPay -> PriceIWTR, without the intermediate models
+    api_unit_price = (
+        real_unit_price_per_unit_stock / unit_stock * API_VS_REAL_PRICE_CONVERT_RATE
+    )
+    price = int(api_unit_price * min_quantity_per_order)
+    return price, price_to_priceiwtr(price, commission_rule)
+
+
 def to_real_unit_price(
     abstract_unit_price: int | float,
 ) -> float:
-    if isinstance(abstract_unit_price, int):
-        return float(abstract_unit_price) / API_VS_REAL_PRICE_CONVERT_RATE
     return abstract_unit_price / API_VS_REAL_PRICE_CONVERT_RATE
 
 
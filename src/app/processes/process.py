@@ -1,20 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
+import math
+from operator import attrgetter
 import random
 
-from app.crwl import extract_offers_or_final_produce, extract_offers, get_state
+from app.crwl import (
+    extract_offers_or_final_produce,
+    extract_many,
+    invalidate_state_cache,
+)
+from app.crwl.exceptions import CrwlError
 from app.crwl.models import (
     CrwlOffer,
     FinalProduct,
     ExtractedOffer,
 )
+from app import config
 from app.kinguin.api import kinguin_client
-from app.shared.consts import CURRENCY
+from app.shared.consts import API_VS_REAL_PRICE_CONVERT_RATE, CURRENCY
 from app.kinguin.models import PriceBase, Offer
 from app.prices.utils import (
     int_to_float_price,
     priceiwtr_to_price,
     price_to_priceiwtr,
+    real_unit_price_per_unit_stock_to_prices,
     to_real_unit_price,
     back_to_abstract_unit_price,
     unit_price_to_price,
@@ -28,21 +38,23 @@ from app.prices.models import (
     RealUnitPrice,
     RealUnitPricePerUnitStock,
     APIUnitPrice,
-    PriceCustomerPay,
     APIUnitPricePerUnitStock,
 )
 from app.shared.utils import formated_datetime
 
 from .shared import extract_offer_id_from_product_link
-from ..shared.decorators import retry_on_fail
 
 from app.sheet.models import RowModel
 
 
 logger = logging.getLogger(__name__)
 
+# Runs API requests that do not depend on the crawl while the worker crawls
+_io_executor = ThreadPoolExecutor(
+    max_workers=2 * config.THREAD_NUMBER, thread_name_prefix="process-io"
+)
+
 
-@retry_on_fail(max_retries=3, sleep_interval=2)
 def update_offer(
     offer_id: str,
     price: PriceBase,
@@ -64,18 +76,10 @@ def calculate_unit_price_change_by_min_offer(
     product_max_real_unit_price_per_unit_stock: RealUnitPricePerUnitStock | None,
     compare_real_unit_price_per_unit_stock: RealUnitPricePerUnitStock,
 ) -> RealUnitPricePerUnitStock:
-    new_min_unit_price_random = (
-        compare_real_unit_price_per_unit_stock.amount - product.DONGIAGIAM_MAX
-        if compare_real_unit_price_per_unit_stock.amount - product.DONGIAGIAM_MAX
-        >= product_min_real_unit_price_per_unit_stock.amount
-        else product_min_real_unit_price_per_unit_stock.amount
-    )
-    new_max_unit_price_random = (
-        compare_real_unit_price_per_unit_stock.amount - product.DONGIAGIAM_MIN
-        if compare_real_unit_price_per_unit_stock.amount - product.DONGIAGIAM_MIN
-        >= product_min_real_unit_price_per_unit_stock.amount
-        else product_min_real_unit_price_per_unit_stock.amount
-    )
+    compare_amount = compare_real_unit_price_per_unit_stock.amount
+    min_amount = product_min_real_unit_price_per_unit_stock.amount
+    new_min_unit_price_random = max(compare_amount - product.DONGIAGIAM_MAX, min_amount)
+    new_max_unit_price_random = max(compare_amount - product.DONGIAGIAM_MIN, min_amount)
     new_unit_price_change = round(
         random.uniform(new_min_unit_price_random, new_max_unit_price_random),
         product.DONGIA_LAMTRON,
@@ -86,13 +90,47 @@ def calculate_unit_price_change_by_min_offer(
     )
 
 
+def calculate_bound_price_update(
+    product: RowModel,
+    my_offer: Offer,
+    bound_real_unit_price_per_unit_stock: RealUnitPricePerUnitStock,
+    stock_without_unit: int | None,
+    price_min: float,
+    price_max: float | None,
+) -> tuple[int, str, str]:
+    # Round target real unit price per unit stock
+    target_real_unit_price_per_unit_stock = round(
+        bound_real_unit_price_per_unit_stock.amount,
+        product.DONGIA_LAMTRON,
+    )
+    target_price_customer_pay, target_priceiwtr = (
+        real_unit_price_per_unit_stock_to_prices(
+            real_unit_price_per_unit_stock=target_real_unit_price_per_unit_stock,
+            unit_stock=product.UNIT_STOCK,
+            min_quantity_per_order=product.UNIT_STOCK * product.MIN_UNIT_PER_ORDER
+            if product.MIN_UNIT_PER_ORDER
+            else 1,
+            commission_rule=my_offer.commissionRule,
+        )
+    )
+    note_message, last_update_message = update_with_min_price(
+        price=int_to_float_price(target_price_customer_pay),
+        priceiwtr=int_to_float_price(target_priceiwtr),
+        unit_price=target_real_unit_price_per_unit_stock,
+        stock=stock_without_unit,
+        min_quantity=product.MIN_UNIT_PER_ORDER,
+        unit_stock=product.UNIT_STOCK,
+        price_min=price_min,
+        price_max=price_max,
+    )
+    return target_priceiwtr, note_message, last_update_message
+
+
 def offers_compare_flow(
     product: RowModel,
     my_offer: Offer,
     offers: dict[str, CrwlOffer],
 ) -> RowModel | None:
-    valid_crwl_offers: dict[str, CrwlOffer] = {}
-
     # Get product data from cache (no API calls!)
     _product_min_price_iwtr: float = product.min_price()
 
@@ -125,116 +163,63 @@ def offers_compare_flow(
     blacklist = product.blacklist()
     stock_without_unit = product.stock()
 
-    logger.info(f"Product min unit price: {_product_min_price_iwtr}")
-    logger.info(f"Product max unit price: {_product_max_price_iwtr}")
-
-    min_unit_price_offer: CrwlOffer | None = None
-
-    # Filter valid offer and find min unit price offer
-    for offer_id, offer in offers.items():
-        # Convert to the same unit on sheet
-        offer_api_unit_price: APIUnitPrice = APIUnitPrice(amount=offer.unitPrice)
-        offer_real_unit_price: RealUnitPrice = offer_api_unit_price.to_real_unit_price()
-        offer_real_unit_price_per_unit_stock = (
-            offer_real_unit_price.to_unit_price_per_unit_stock(
-                unit_stock=product.UNIT_STOCK
-            )
-        )
+    logger.info("Product min unit price: %s", _product_min_price_iwtr)
+    logger.info("Product max unit price: %s", _product_max_price_iwtr)
+
+    # Price bounds and unit stock, looked up once for the whole scan
+    unit_stock = product.UNIT_STOCK
+    min_bound = product_min_real_unit_price_per_unit_stock.amount
+    # No max price leaves the range open, so the scan needs no None check
+    max_bound = (
+        product_max_real_unit_price_per_unit_stock.amount
+        if product_max_real_unit_price_per_unit_stock
+        else math.inf
+    )
 
-        if offer.seller.name not in blacklist:
-            if (
-                product_max_real_unit_price_per_unit_stock
-                and product_min_real_unit_price_per_unit_stock.amount
-                <= offer_real_unit_price_per_unit_stock.amount
-                <= product_max_real_unit_price_per_unit_stock.amount
-            ) or (
-                product_max_real_unit_price_per_unit_stock is None
-                and product_min_real_unit_price_per_unit_stock.amount
-                <= offer_real_unit_price_per_unit_stock.amount
-            ):
-                valid_crwl_offers[offer_id] = offer
-                if (
-                    min_unit_price_offer is None
-                    or offer.unitPrice < min_unit_price_offer.unitPrice
-                ):
-                    min_unit_price_offer = offer
+    def is_valid_offer(offer: CrwlOffer) -> bool:
+        if offer.seller.name in blacklist:
+            return False
+        # Convert to the same unit on sheet, with the same arithmetic as
+        # APIUnitPrice -> RealUnitPrice -> RealUnitPricePerUnitStock
+        offer_amount = offer.unitPrice / API_VS_REAL_PRICE_CONVERT_RATE * unit_stock
+        return min_bound <= offer_amount <= max_bound
+
+    # Find the min unit price offer among valid ones, the first one on ties
+    min_unit_price_offer: CrwlOffer | None = min(
+        filter(is_valid_offer, offers.values()),
+        key=attrgetter("unitPrice"),
+        default=None,
+    )
 
     # Determine target price
-    target_priceiwtr = None
-    note_message = ""
-
     if min_unit_price_offer is None:
         if product_max_real_unit_price_per_unit_stock:
             logger.info("Update by max price")
-            # Round target real unit price per unit stock
-            product_max_real_unit_price_per_unit_stock.amount = round(
-                product_max_real_unit_price_per_unit_stock.amount,
-                product.DONGIA_LAMTRON,
-            )
-            # Convert to api unit price
-            target_api_unit_price: APIUnitPrice = (
-                product_max_real_unit_price_per_unit_stock.to_api_unit_price()
-            )
-            # Convert to price customer pay
-            target_price_customer_pay: PriceCustomerPay = (
-                target_api_unit_price.to_price_customer_pay(
-                    min_quantity_per_order=product.UNIT_STOCK
-                    * product.MIN_UNIT_PER_ORDER
-                    if product.MIN_UNIT_PER_ORDER
-                    else 1
+            target_priceiwtr, note_message, last_update_message = (
+                calculate_bound_price_update(
+                    product=product,
+                    my_offer=my_offer,
+                    bound_real_unit_price_per_unit_stock=product_max_real_unit_price_per_unit_stock,
+                    stock_without_unit=stock_without_unit,
+                    price_min=_product_min_price_iwtr,
+                    price_max=_product_max_price_iwtr,
                 )
             )
-            # Convert to price I want to receive
-            target_priceiwtr = target_price_customer_pay.to_priceiwtr(
-                commission_rule=my_offer.commissionRule
-            )
-            note_message, last_update_message = update_with_min_price(
-                price=target_price_customer_pay.to_real_price().amount,
-                priceiwtr=target_priceiwtr.to_real_price().amount,
-                unit_price=product_max_real_unit_price_per_unit_stock.amount,
-                stock=stock_without_unit,
-                min_quantity=product.MIN_UNIT_PER_ORDER,
-                unit_stock=product.UNIT_STOCK,
-                price_min=_product_min_price_iwtr,
-                price_max=_product_max_price_iwtr,
-            )
 
         else:
             logger.info("Update by min price")
-            # Round target real unit price per unit stock
-            product_min_real_unit_price_per_unit_stock.amount = round(
-                product_min_real_unit_price_per_unit_stock.amount,
-                product.DONGIA_LAMTRON,
-            )
-            # Convert to api unit price
-            target_api_unit_price: APIUnitPrice = (
-                product_min_real_unit_price_per_unit_stock.to_api_unit_price()
-            )
-            # Convert to price customer pay
-            target_price_customer_pay: PriceCustomerPay = (
-                target_api_unit_price.to_price_customer_pay(
-                    min_quantity_per_order=product.UNIT_STOCK
-                    * product.MIN_UNIT_PER_ORDER
-                    if product.MIN_UNIT_PER_ORDER
-                    else 1
+            target_priceiwtr, note_message, last_update_message = (
+                calculate_bound_price_update(
+                    product=product,
+                    my_offer=my_offer,
+                    bound_real_unit_price_per_unit_stock=product_min_real_unit_price_per_unit_stock,
+                    stock_without_unit=stock_without_unit,
+                    price_min=_product_min_price_iwtr,
+                    price_max=None,
                 )
             )
-            # Convert to price I want to receive
-            target_priceiwtr = target_price_customer_pay.to_priceiwtr(
-                commission_rule=my_offer.commissionRule
-            )
-            note_message, last_update_message = update_with_min_price(
-                price=target_price_customer_pay.to_real_price().amount,
-                priceiwtr=target_priceiwtr.to_real_price().amount,
-                unit_price=product_min_real_unit_price_per_unit_stock.amount,
-                stock=stock_without_unit,
-                min_quantity=product.MIN_UNIT_PER_ORDER,
-                unit_stock=product.UNIT_STOCK,
-                price_min=_product_min_price_iwtr,
-                price_max=None,
-            )
     else:
-        logger.info(f"Found competitor: {min_unit_price_offer.seller.name}")
+        logger.info("Found competitor: %s", min_unit_price_offer.seller.name)
 
         # Convert competitor price to same unit
         compare_api_unit_price: APIUnitPrice = APIUnitPrice(
@@ -265,9 +250,10 @@ def offers_compare_flow(
                 < compare_real_unit_price_per_unit_stock.amount
             ):
                 logger.info(
-                    f"Mode 2: Current price ({current_real_unit_price_per_unit_stock.amount}) "
-                    f"already lower than competitor ({compare_real_unit_price_per_unit_stock.amount}). "
-                    f"No update needed."
+                    "Mode 2: Current price (%s) already lower than competitor (%s). "
+                    "No update needed.",
+                    current_real_unit_price_per_unit_stock.amount,
+                    compare_real_unit_price_per_unit_stock.amount,
                 )
                 note_message = (
                     f"Giá đã tốt hơn đối thủ, không cần cập nhật! "
@@ -280,7 +266,7 @@ def offers_compare_flow(
                 return product
 
         # Calculate new price based on competitor
-        logger.info(f"Update price by price of {min_unit_price_offer.seller.name}")
+        logger.info("Update price by price of %s", min_unit_price_offer.seller.name)
 
         target_real_unit_price_per_unit_stock = calculate_unit_price_change_by_min_offer(
             product=product,
@@ -289,20 +275,19 @@ def offers_compare_flow(
             compare_real_unit_price_per_unit_stock=compare_real_unit_price_per_unit_stock,
         )
         logger.info(target_real_unit_price_per_unit_stock.amount)
-        target_api_unit_price = (
-            target_real_unit_price_per_unit_stock.to_api_unit_price()
-        )
-        target_price_customer_pay = target_api_unit_price.to_price_customer_pay(
-            min_quantity_per_order=product.MIN_UNIT_PER_ORDER * product.UNIT_STOCK
-            if product.MIN_UNIT_PER_ORDER
-            else 1
-        )
-        target_priceiwtr = target_price_customer_pay.to_priceiwtr(
-            commission_rule=my_offer.commissionRule
+        target_price_customer_pay, target_priceiwtr = (
+            real_unit_price_per_unit_stock_to_prices(
+                real_unit_price_per_unit_stock=target_real_unit_price_per_unit_stock.amount,
+                unit_stock=product.UNIT_STOCK,
+                min_quantity_per_order=product.MIN_UNIT_PER_ORDER * product.UNIT_STOCK
+                if product.MIN_UNIT_PER_ORDER
+                else 1,
+                commission_rule=my_offer.commissionRule,
+            )
         )
         note_message, last_update_message = update_with_comparing_seller(
-            price=target_price_customer_pay.to_real_price().amount,
-            priceiwtr=target_priceiwtr.to_real_price().amount,
+            price=int_to_float_price(target_price_customer_pay),
+            priceiwtr=int_to_float_price(target_priceiwtr),
             unit_price=target_real_unit_price_per_unit_stock.amount,
             stock=stock_without_unit if stock_without_unit else None,
             unit_stock=product.UNIT_STOCK,
@@ -321,27 +306,44 @@ def offers_compare_flow(
             * product.UNIT_STOCK,
         )
 
-    if target_priceiwtr:
+    declared_stock = (
+        stock_without_unit * product.UNIT_STOCK if stock_without_unit else None
+    )
+    min_quantity = (
+        product.MIN_UNIT_PER_ORDER * product.UNIT_STOCK
+        if product.MIN_UNIT_PER_ORDER
+        else product.MIN_UNIT_PER_ORDER
+    )
+
+    # Skip the Kinguin call when the offer already has the target price and stock
+    if (
+        target_priceiwtr == my_offer.priceIWTR.amount
+        and declared_stock == my_offer.declaredStock
+        and (not min_quantity or min_quantity == my_offer.minQuantity)
+    ):
+        logger.info("Offer already up to date, no update needed")
+        # Nothing was sent, so the note must not claim the price was updated
+        note_message = (
+            f"{last_update_message}:Giá và stock đã đúng, không cần cập nhật! "
+            f"PriceIWTR = {int_to_float_price(target_priceiwtr)}; "
+            f"Stock = {stock_without_unit if stock_without_unit else None}; "
+            f"Unit Stock = {product.UNIT_STOCK}"
+        )
+    else:
         update_offer(
             offer_id=my_offer.id,
             price=PriceBase(
-                amount=target_priceiwtr.amount,
+                amount=target_priceiwtr,
                 currency=CURRENCY,
             ),
-            declaredStock=stock_without_unit * product.UNIT_STOCK
-            if stock_without_unit
-            else None,
-            min_quantity=product.MIN_UNIT_PER_ORDER * product.UNIT_STOCK
-            if product.MIN_UNIT_PER_ORDER
-            else product.MIN_UNIT_PER_ORDER,
+            declaredStock=declared_stock,
+            min_quantity=min_quantity,
         )
 
-    if note_message:
-        product.Note = note_message
-        product.Last_update = formated_datetime(datetime.now())
-        return product
-
-    return None
+    product.Note = note_message
+    # Same timestamp as the one starting the note
+    product.Last_update = last_update_message
+    return product
 
 
 def ingame_category_compare_flow(
@@ -353,12 +355,12 @@ def ingame_category_compare_flow(
     product_min_unit_price = product.min_price()
     product_max_unit_price = product.max_price()
 
+    unit_stock = product.UNIT_STOCK
     valid_final_products: dict[str, FinalProduct] = {}
 
     for product_id, final_product in final_products.items():
         real_offer_unit_price = (
-            to_real_unit_price(final_product.ingameAttributes.unitPrice)
-            * product.UNIT_STOCK
+            to_real_unit_price(final_product.ingameAttributes.unitPrice) * unit_stock
         )
         if (
             product_max_unit_price
@@ -371,51 +373,78 @@ def ingame_category_compare_flow(
         ):
             valid_final_products[product_id] = final_product
 
+    if not valid_final_products:
+        logger.info("No final product in price range, update by bound price")
+        return offers_compare_flow(product=product, my_offer=my_offer, offers={})
+
+    urls = [
+        f"https://www.kinguin.net/category/{final_product.externalId}/{final_product.attributes.urlKey}"
+        for final_product in valid_final_products.values()
+    ]
+
+    # Final product pages load side by side, each in its own tab
     offers: dict[str, CrwlOffer] = {}
-    for product_id, final_product in valid_final_products.items():
-        state = get_state(
-            sb,
-            f"https://www.kinguin.net/category/{final_product.externalId}/{final_product.attributes.urlKey}",
-        )
-        offers.update(extract_offers(state))
+    for url, extracted_data in zip(urls, extract_many(sb, urls)):
+        if not isinstance(extracted_data, ExtractedOffer):
+            raise CrwlError(f"Cannot extract offers from {url}")
+        offers.update(extracted_data.data)
 
-    return offers_compare_flow(
-        product=product,
-        my_offer=my_offer,
-        offers=offers,
-    )
+    try:
+        return offers_compare_flow(
+            product=product,
+            my_offer=my_offer,
+            offers=offers,
+        )
+    finally:
+        # These pages may now show our offer at its old price
+        for url in urls:
+            invalidate_state_cache(url)
 
 
 def check_product_compare_flow(
     sb,
     product: RowModel,
 ) -> RowModel | None:
-    logger.info(f"Processing for {product.Product_name}")
-    logger.info(f"Crawling at: {product.PRODUCT_COMPARE}")
+    logger.info("Processing for %s", product.Product_name)
+    logger.info("Crawling at: %s", product.PRODUCT_COMPARE)
 
     my_offer_id = extract_offer_id_from_product_link(product.Product_link)
 
-    my_offer = kinguin_client.get_offer(offer_id=my_offer_id)
+    # My offer and the config sheets don't depend on the crawl, fetch them meanwhile
+    my_offer_future = _io_executor.submit(
+        kinguin_client.get_offer, offer_id=my_offer_id
+    )
+    config_sheets_future = _io_executor.submit(product.load_config_sheets)
 
     extracted_data = extract_offers_or_final_produce(sb, product.PRODUCT_COMPARE)
 
-    if isinstance(extracted_data, ExtractedOffer):
-        return offers_compare_flow(
-            product=product, my_offer=my_offer, offers=extracted_data.data
-        )
+    my_offer = my_offer_future.result()
+    config_sheets_future.result()
 
-    else:
-        return ingame_category_compare_flow(
-            sb,
-            product=product,
-            my_offer=my_offer,
-            final_products=extracted_data.data,
-        )
+    try:
+        if isinstance(extracted_data, ExtractedOffer):
+            return offers_compare_flow(
+                product=product, my_offer=my_offer, offers=extracted_data.data
+            )
+
+        else:
+            return ingame_category_compare_flow(
+                sb,
+                product=product,
+                my_offer=my_offer,
+                final_products=extracted_data.data,
+            )
+    finally:
+        # Rows sharing this compare link must not see prices from before our update
+        invalidate_state_cache(product.PRODUCT_COMPARE)
 
 
 def no_check_product_compare_flow(
     product: RowModel,
 ) -> RowModel:
+    # This flow never reads the blacklist, so its sheet is not fetched
+    product.load_config_sheets(with_blacklist=False)
+
     product_min_unit_price_iwtr = product.min_price()
     product_max_unit_price_iwtr = product.max_price()
     stock = product.stock()
@@ -431,7 +460,8 @@ def no_check_product_compare_flow(
     )
 
     my_offer_id = extract_offer_id_from_product_link(product.Product_link)
-    my_offer = kinguin_client.get_offer(offer_id=my_offer_id)
+    # Only the commission rule is needed here, for the note
+    commission_rule = kinguin_client.get_commission_rule(offer_id=my_offer_id)
 
     update_offer(
         offer_id=my_offer_id,
@@ -446,7 +476,7 @@ def no_check_product_compare_flow(
 
     note_message, last_update_message = update_with_min_price(
         price=int_to_float_price(
-            priceiwtr_to_price(abstract_unit_price_iwtr, my_offer.commissionRule)
+            priceiwtr_to_price(abstract_unit_price_iwtr, commission_rule)
         ),
         priceiwtr=int_to_float_price(abstract_unit_price_iwtr),
         unit_price=product_min_unit_price_iwtr,
@@ -458,7 +488,7 @@ def no_check_product_compare_flow(
     )
 
     product.Note = note_message
-    product.Last_update = formated_datetime(datetime.now())
+    product.Last_update = last_update_message
     return product
 
 
@@ -1,3 +1,3 @@
 def extract_offer_id_from_product_link(link: str) -> str:
     """Extract offer ID from product link"""
-    return link.split("/")[-1]
+    return link.rpartition("/")[2]
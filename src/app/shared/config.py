@@ -21,6 +21,10 @@ class Config(BaseModel):
     # Thread number
     THREAD_NUMBER: int
 
+    # Opt in to building crawled models without validation. The state comes from a
+    # third-party page, so it is validated unless this is set
+    CRWL_FAST_VALIDATION: bool = False
+
     @staticmethod
     def from_env(dotenv_path: str = "settings.env") -> "Config":
         load_dotenv(dotenv_path)
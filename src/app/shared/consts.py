@@ -1,11 +1,24 @@
 from typing import Final
 
 WINDOW_PRELOADEDSTATE_EXPRESSION: Final[str] = "window._preloadedState"
+STATE_JSON_EXPRESSION: Final[str] = f"JSON.stringify({WINDOW_PRELOADEDSTATE_EXPRESSION})"
+STATE_READY_EXPRESSION: Final[str] = (
+    f"document.readyState === 'complete' && !!{WINDOW_PRELOADEDSTATE_EXPRESSION}"
+)
+STATE_READY_TIMEOUT: Final[float] = 2
+STATE_READY_POLL_INTERVAL: Final[float] = 0.2
+STATE_CACHE_MAX_SIZE: Final[int] = 64
+STATE_CACHE_TTL: Final[float] = 30
+# Retries of a whole crawl (navigate, wait, read) and of reading one loaded page
+STATE_CRAWL_MAX_RETRIES: Final[int] = 10
+STATE_EXTRACT_MAX_RETRIES: Final[int] = 3
+STATE_RETRY_INTERVAL: Final[float] = 5
 COL_META_FIELD_NAME: Final[str] = "col_name_xxx"
 
 KINGUIN_TOKEN_BASE_URL: Final[str] = "https://id.kinguin.net/auth/token"
 KINGUIN_API_BASE_URL: Final[str] = "https://gateway.kinguin.net/sales-manager-api"
 
 CURRENCY: Final[str] = "EUR"
+COMMISSION_RULE_CACHE_TTL: Final[float] = 600
 
 API_VS_REAL_PRICE_CONVERT_RATE: Final[int] = 100
@@ -1,21 +1,53 @@
+import asyncio
+import inspect
 import time
 from typing import Callable
 from app import logger
 
 
-def retry_on_fail(max_retries: int = 3, sleep_interval: float = 0.5):
+def retry_on_fail(
+    max_retries: int = 3,
+    sleep_interval: float = 0.5,
+    delay_fn: Callable[[Exception, int], float | None] | None = None,
+    give_up: Callable[[Exception], bool] | None = None,
+):
+    """
+    Retry the wrapped function when it raises, coroutine functions included
+
+    Args:
+        max_retries (int): Number of retries after the first call
+        sleep_interval (float): Delay between retries, also the cap for delay_fn
+        delay_fn (Callable | None): Maps (exception, attempt) to a delay in seconds,
+            None falls back to sleep_interval
+        give_up (Callable | None): Returns True for exceptions that must raise at once
+    """
+
+    def retry_delay(func: Callable, e: Exception, i: int) -> float:
+        # Raise when out of retries, otherwise log and return the delay
+        if i == max_retries or (give_up is not None and give_up(e)):
+            raise e
+        logger.info(f"Retry: {func.__name__}, {i + 1} times, failed reason: {e}")
+        delay = delay_fn(e, i) if delay_fn else None
+        return sleep_interval if delay is None else min(delay, sleep_interval)
+
     def wrapper(func: Callable):
+        if inspect.iscoroutinefunction(func):
+
+            async def ainner(*args, **kwagrs):
+                for i in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwagrs)
+                    except Exception as e:
+                        await asyncio.sleep(retry_delay(func, e, i))
+
+            return ainner
+
         def inner(*args, **kwagrs):
             for i in range(max_retries + 1):
                 try:
                     return func(*args, **kwagrs)
                 except Exception as e:
-                    if i == max_retries:
-                        raise e
-                    logger.info(
-                        f"Retry: {func.__name__}, {i + 1} times, failed reason: {e}"
-                    )
-                    time.sleep(sleep_interval)
+                    time.sleep(retry_delay(func, e, i))
 
         return inner
 
@@ -1,3 +1,6 @@
+from functools import cache
+from itertools import chain
+
 from pydantic import BaseModel, ConfigDict
 from typing import Annotated, Final, Self
 
@@ -21,7 +24,10 @@ class ColSheetModel(BaseModel):
     sheet_name: str
     index: int
 
+    # Field metadata is fixed once the class is built, so both mappings are
+    # computed once per class. Callers must not mutate the returned dicts.
     @classmethod
+    @cache
     def mapping_fields(cls) -> dict:
         mapping_fields = {}
         for field_name, field_info in cls.model_fields.items():
@@ -34,6 +40,7 @@ class ColSheetModel(BaseModel):
         return mapping_fields
 
     @classmethod
+    @cache
     def updated_mapping_fields(cls) -> dict:
         """
         Get a mapping of model field names to column names for fields that are marked as updatable.
@@ -236,6 +243,40 @@ class RowModel(ColSheetModel):
     CELL_BLACKLIST: Annotated[str, {COL_META: "Y"}]
     RELAX_TIME: Annotated[int, {COL_META: "Z"}]
 
+    def config_sheets(self, with_blacklist: bool = True) -> list[tuple[str, str]]:
+        """
+        Get the (sheet_id, sheet_name) pairs holding this row's min price, max price,
+        stock and blacklist.
+        Args:
+            with_blacklist (bool): Include the blacklist sheet, which only flows
+                comparing offers read.
+        Returns:
+            list[tuple[str, str]]: Pairs for every source its getter would read,
+            so max price and stock only count when their cell is set too.
+        """
+        sources = [(self.IDSHEET_MIN, self.SHEET_MIN)]
+        if with_blacklist:
+            sources.append((self.IDSHEET_BLACKLIST, self.SHEET_BLACKLIST))
+        if self.CELL_MAX is not None:
+            sources.append((self.IDSHEET_MAX, self.SHEET_MAX))
+        if self.CELL_STOCK is not None:
+            sources.append((self.IDSHEET_STOCK, self.SHEET_STOCK))
+
+        return [
+            (sheet_id, sheet_name)
+            for sheet_id, sheet_name in sources
+            if sheet_id is not None and sheet_name is not None
+        ]
+
+    def load_config_sheets(self, with_blacklist: bool = True) -> None:
+        """
+        Load every config sheet of this row up front, with one batchGet per spreadsheet,
+        so min_price(), max_price(), stock() and blacklist() read from the cache.
+        Args:
+            with_blacklist (bool): Also load the blacklist sheet.
+        """
+        gsheet_cache_manager.bulk_load(self.config_sheets(with_blacklist))
+
     def min_price(self) -> float:
         gsheet_cache_manager.add_sheet(
             sheet_id=self.IDSHEET_MIN,
@@ -293,7 +334,7 @@ class RowModel(ColSheetModel):
 
         return None
 
-    def blacklist(self) -> list[str]:
+    def blacklist(self) -> frozenset[str]:
         gsheet_cache_manager.add_sheet(
             sheet_id=self.IDSHEET_BLACKLIST,
             sheet_name=self.SHEET_BLACKLIST,
@@ -305,14 +346,8 @@ class RowModel(ColSheetModel):
             a1_range=self.CELL_BLACKLIST,
         )
 
-        if blacklist:
-            res = []
-            for blist in blacklist:
-                for i in blist:
-                    res.append(i)
-            return res
-
-        return []
+        # Built as a set once, so membership checks in the offer scan are O(1)
+        return frozenset(chain.from_iterable(blacklist))
 
     @classmethod
     @retry_on_fail(max_retries=5, sleep_interval=10)
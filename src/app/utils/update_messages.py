@@ -8,6 +8,21 @@ def last_update_message(
     return formatted_date
 
 
+def _format_update_note(
+    last_update: str,
+    price: float,
+    priceiwtr: float,
+    unit_price: int | float,
+    stock: int | None,
+    unit_stock: int,
+    min_quantity: int | None,
+    price_min: float,
+    price_max: float | None,
+    price_separator: str = "; ",
+) -> str:
+    return f"{last_update}:Giá đã cập nhật thành công; PriceCustomerPay: {price}{price_separator}PriceIWTR = {priceiwtr}; Unit Price: {unit_price}; Stock = {stock}; Unit Stock = {unit_stock}; MinUnitPerOrder = {min_quantity}; UnitPriceMin = {price_min}, UnitPriceMax = {price_max}"
+
+
 def update_with_min_price(
     price: float,
     priceiwtr: float,
@@ -18,9 +33,20 @@ def update_with_min_price(
     price_min: float,
     price_max: float | None = None,
 ) -> tuple[str, str]:
-    now = datetime.now()
-    _last_update_message = last_update_message(now)
-    note_message = f"""{_last_update_message}:Giá đã cập nhật thành công; PriceCustomerPay: {price} ;PriceIWTR = {priceiwtr}; Unit Price: {unit_price}; Stock = {stock}; Unit Stock = {unit_stock}; MinUnitPerOrder = {min_quantity}; UnitPriceMin = {price_min}, UnitPriceMax = {price_max}"""
+    _last_update_message = last_update_message(datetime.now())
+    note_message = _format_update_note(
+        _last_update_message,
+        price,
+        priceiwtr,
+        unit_price,
+        stock,
+        unit_stock,
+        min_quantity,
+        price_min,
+        price_max,
+        # This note has always read "{price} ;PriceIWTR"
+        price_separator=" ;",
+    )
     return note_message, _last_update_message
 
 
@@ -37,9 +63,21 @@ def update_with_comparing_seller(
     comparing_seller_unit_price: float | int,
     price_max: float | None = None,
 ) -> tuple[str, str]:
-    now = datetime.now()
-    _last_update_message = last_update_message(now)
-    note_message = f"""{last_update_message(now)}:Giá đã cập nhật thành công; PriceCustomerPay: {price}; PriceIWTR = {priceiwtr}; Unit Price: {unit_price}; Stock = {stock}; Unit Stock = {unit_stock}; MinUnitPerOrder = {min_quantity}; UnitPriceMin = {price_min}, UnitPriceMax = {price_max} - Seller: {comparing_seller}, SellerPriceIWTR: {comparing_seller_actual_price}, SellerUnitPrice: {comparing_seller_unit_price}"""
+    _last_update_message = last_update_message(datetime.now())
+    note_message = (
+        _format_update_note(
+            _last_update_message,
+            price,
+            priceiwtr,
+            unit_price,
+            stock,
+            unit_stock,
+            min_quantity,
+            price_min,
+            price_max,
+        )
+        + f" - Seller: {comparing_seller}, SellerPriceIWTR: {comparing_seller_actual_price}, SellerUnitPrice: {comparing_seller_unit_price}"
+    )
     return note_message, _last_update_message
 
 
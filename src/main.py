@@ -23,6 +23,18 @@ for _ in range(config.THREAD_NUMBER):
     browser_manager.create_browser(uc=True, headless=True)
 
 
+def write_row_error(index: int, note: str) -> None:
+    update_mapping = RowModel.updated_mapping_fields()
+    with gsheet_cache_manager.batch(
+        sheet_id=config.SHEET_ID, sheet_name=config.SHEET_NAME
+    ) as sheet:
+        sheet.update_value(f"{update_mapping['Note']}{index}", note)
+        sheet.update_value(
+            f"{update_mapping['Last_update']}{index}",
+            formated_datetime(datetime.datetime.now()),
+        )
+
+
 def worker(index_queue: Queue, result_queue: Queue, worker_id: int):
     thread_prefix = f"[Worker-{worker_id}]"
 
@@ -51,34 +63,10 @@ def worker(index_queue: Queue, result_queue: Queue, worker_id: int):
         except ValidationError as e:
             logger.exception(f"{thread_prefix} VALIDATION ERROR AT ROW: {index}")
             logger.exception(e.errors())
-            update_mapping = RowModel.updated_mapping_fields()
-            gsheet_cache_manager.update_value(
-                sheet_id=config.SHEET_ID,
-                sheet_name=config.SHEET_NAME,
-                cell=f"{update_mapping['Note']}{index}",
-                value=f"VALIDATION ERROR: {e.errors()}",
-            )
-            gsheet_cache_manager.update_value(
-                sheet_id=config.SHEET_ID,
-                sheet_name=config.SHEET_NAME,
-                cell=f"{update_mapping['Last_update']}{index}",
-                value=formated_datetime(datetime.datetime.now()),
-            )
+            write_row_error(index, f"VALIDATION ERROR: {e.errors()}")
         except Exception as e:
             logger.exception(f"{thread_prefix} FAILED AT ROW: {index}")
-            update_mapping = RowModel.updated_mapping_fields()
-            gsheet_cache_manager.update_value(
-                sheet_id=config.SHEET_ID,
-                sheet_name=config.SHEET_NAME,
-                cell=f"{update_mapping['Note']}{index}",
-                value=f"ERROR: {e}",
-            )
-            gsheet_cache_manager.update_value(
-                sheet_id=config.SHEET_ID,
-                sheet_name=config.SHEET_NAME,
-                cell=f"{update_mapping['Last_update']}{index}",
-                value=formated_datetime(datetime.datetime.now()),
-            )
+            write_row_error(index, f"ERROR: {e}")
 
         finally:
             index_queue.task_done()